@@ -1,10 +1,15 @@
 # ============ bot.py ============
 """
 Главный файл запуска Telegram бота.
-Инициализирует базу данных, регистрирует роутеры и запускает polling.
+Инициализирует базу данных, регистрирует роутеры и запускает
+polling или webhook (настройка BOT_MODE), в одном процессе или
+с обработкой апдейтов в нескольких процессах (SHARD_WORKERS).
 """
 import asyncio
 
+from aiogram import Dispatcher
+
+from config.bot_config import BOT_MODE, DROP_PENDING_UPDATES, SHARD_WORKERS
 from loader import bot, dp
 from handlers.registration import registration_router
 from handlers.auth import auth_router
@@ -13,9 +18,46 @@ from handlers.courses import courses_router
 from handlers.admin import admin_router
 from handlers.my_courses import my_courses_router
 from handlers.certificates import certificates_router
+from middlewares.user_context import UserMiddleware, UserLoaderMiddleware
+from middlewares.throttling import ThrottlingMiddleware
+from middlewares.menu_action import MenuActionMiddleware
 from notifier import setup_scheduler
 from db.models import create_db, seed_courses
-from db.session import engine
+from db.session import write_engine
+from sharding import run_sharded
+from webhook import run_webhook
+
+
+def setup_dispatcher(dispatcher: Dispatcher) -> None:
+    """
+    Зарегистрировать middleware и роутеры в диспетчере.
+
+    Args:
+        dispatcher: Диспетчер aiogram
+    """
+    # Язык из кеша, пользователь из БД не более одного раза на апдейт
+    dispatcher.update.outer_middleware(UserMiddleware())
+
+    # Действие кнопки меню — один раз на сообщение, до фильтров MenuButton
+    dispatcher.message.outer_middleware(MenuActionMiddleware())
+
+    # Лимит частоты — до загрузки пользователя, чтобы лишние апдейты
+    # не доходили до БД
+    throttling = ThrottlingMiddleware()
+    dispatcher.message.middleware(throttling)
+    dispatcher.callback_query.middleware(throttling)
+
+    dispatcher.message.middleware(UserLoaderMiddleware())
+    dispatcher.callback_query.middleware(UserLoaderMiddleware())
+
+    # Регистрируем роутеры
+    dispatcher.include_router(start_router)
+    dispatcher.include_router(registration_router)
+    dispatcher.include_router(auth_router)
+    dispatcher.include_router(courses_router)
+    dispatcher.include_router(my_courses_router)
+    dispatcher.include_router(admin_router)
+    dispatcher.include_router(certificates_router)
 
 
 async def main() -> None:
@@ -25,30 +67,31 @@ async def main() -> None:
     Выполняет:
     - Создание таблиц в БД
     - Добавление дефолтных курсов
-    - Регистрацию роутеров
+    - Регистрацию middleware и роутеров
     - Запуск планировщика уведомлений
-    - Запуск polling
+    - Запуск polling или webhook
     """
     # Создаём таблицы
-    await create_db(engine)
+    await create_db(write_engine)
 
     # Добавляем дефолтные курсы
     await seed_courses()
 
-    # Регистрируем роутеры
-    dp.include_router(start_router)
-    dp.include_router(registration_router)
-    dp.include_router(auth_router)
-    dp.include_router(courses_router)
-    dp.include_router(my_courses_router)
-    dp.include_router(admin_router)
-    dp.include_router(certificates_router)
+    setup_dispatcher(dp)
 
     # Запускаем планировщик
     setup_scheduler()
 
-    # Очищаем апдейты и стартуем бота
-    await bot.delete_webhook(drop_pending_updates=True)
+    if SHARD_WORKERS > 1:
+        await run_sharded(dp, bot, SHARD_WORKERS)
+        return
+
+    if BOT_MODE == "webhook":
+        await run_webhook(dp, bot)
+        return
+
+    # Снимаем webhook и стартуем polling
+    await bot.delete_webhook(drop_pending_updates=DROP_PENDING_UPDATES)
     await dp.start_polling(bot)
 
 
@@ -0,0 +1,208 @@
+"""
+Модуль массовых рассылок.
+Отправляет сообщения параллельно с учётом лимитов Telegram
+(общего и на один чат), повторяет отправку после RetryAfter
+и возвращает итоговый отчёт.
+"""
+import asyncio
+import time
+from collections.abc import AsyncIterable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramForbiddenError,
+    TelegramNetworkError,
+    TelegramRetryAfter,
+    TelegramServerError
+)
+
+from config.bot_config import (
+    BROADCAST_RATE,
+    BROADCAST_CONCURRENCY,
+    BROADCAST_RETRIES
+)
+from outbox import PRIORITY_BROADCAST, outbox_priority
+from utils.rate_limit import TokenBucket
+
+# Telegram допускает не больше одного сообщения в секунду в один чат
+PER_CHAT_RATE = 1
+
+# Итоги отправки одного сообщения
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+STATUS_BLOCKED = "blocked"
+
+
+@dataclass
+class BroadcastReport:
+    """Итоги рассылки."""
+
+    total: int = 0
+    sent: int = 0
+    failed: int = 0
+    blocked: int = 0
+    retries: int = 0
+    duration: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"всего {self.total}, отправлено {self.sent}, "
+            f"ошибок {self.failed}, заблокировали бота {self.blocked}, "
+            f"повторов {self.retries}, за {self.duration:.1f} с"
+        )
+
+    def add(self, other: "BroadcastReport") -> None:
+        """
+        Прибавить итоги другой рассылки.
+
+        Args:
+            other: Отчёт другой рассылки
+        """
+        self.total += other.total
+        self.sent += other.sent
+        self.failed += other.failed
+        self.blocked += other.blocked
+        self.retries += other.retries
+        self.duration += other.duration
+
+
+class Broadcaster:
+    """
+    Движок рассылок.
+
+    Args:
+        bot: Экземпляр бота
+        rate: Общий лимит сообщений в секунду (0 — без ограничения)
+        concurrency: Максимум одновременных запросов
+        max_retries: Максимум повторов одного сообщения
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        rate: float = BROADCAST_RATE,
+        concurrency: int = BROADCAST_CONCURRENCY,
+        max_retries: int = BROADCAST_RETRIES
+    ) -> None:
+        self.bot = bot
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.limiter = TokenBucket(rate) if rate > 0 else None
+
+    async def broadcast(
+        self,
+        messages: Iterable[tuple[int, str]] | AsyncIterable[tuple[int, str]],
+        on_result: Callable[[int, str], None] | None = None,
+        **kwargs: Any
+    ) -> BroadcastReport:
+        """
+        Разослать сообщения.
+
+        Args:
+            messages: Пары (chat_id, текст); можно передать асинхронный
+                итератор, чтобы не держать всю рассылку в памяти
+            on_result: Вызывается с (chat_id, статус) после каждой
+                отправки; статус — STATUS_SENT, STATUS_FAILED
+                или STATUS_BLOCKED
+            **kwargs: Дополнительные параметры send_message
+
+        Returns:
+            Отчёт о рассылке
+        """
+        with outbox_priority(PRIORITY_BROADCAST):
+            return await self._broadcast(messages, on_result, **kwargs)
+
+    async def _broadcast(
+        self,
+        messages: Iterable[tuple[int, str]] | AsyncIterable[tuple[int, str]],
+        on_result: Callable[[int, str], None] | None,
+        **kwargs: Any
+    ) -> BroadcastReport:
+        """Разослать сообщения; задачи отправки наследуют приоритет рассылки."""
+        report = BroadcastReport()
+        started = time.monotonic()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        chat_limiters: dict[int, TokenBucket] = {}
+        tasks: set[asyncio.Task] = set()
+
+        async def send(chat_id: int, text: str) -> None:
+            try:
+                limiter = chat_limiters.setdefault(
+                    chat_id,
+                    TokenBucket(PER_CHAT_RATE)
+                )
+                status = await self._send(
+                    chat_id,
+                    text,
+                    limiter,
+                    report,
+                    **kwargs
+                )
+                if on_result:
+                    on_result(chat_id, status)
+            finally:
+                semaphore.release()
+
+        async def schedule(chat_id: int, text: str) -> None:
+            report.total += 1
+            await semaphore.acquire()
+            task = asyncio.create_task(send(chat_id, text))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if isinstance(messages, AsyncIterable):
+            async for chat_id, text in messages:
+                await schedule(chat_id, text)
+        else:
+            for chat_id, text in messages:
+                await schedule(chat_id, text)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+        report.duration = time.monotonic() - started
+        return report
+
+    async def _send(
+        self,
+        chat_id: int,
+        text: str,
+        chat_limiter: TokenBucket,
+        report: BroadcastReport,
+        **kwargs: Any
+    ) -> str:
+        """Отправить одно сообщение с повторами и вернуть статус."""
+        for attempt in range(self.max_retries + 1):
+            await chat_limiter.acquire()
+            if self.limiter:
+                await self.limiter.acquire()
+            try:
+                await self.bot.send_message(chat_id, text, **kwargs)
+                report.sent += 1
+                return STATUS_SENT
+            except TelegramRetryAfter as e:
+                # Флуд-контроль касается всего бота: притормаживаем всех
+                if self.limiter:
+                    self.limiter.pause(e.retry_after)
+                else:
+                    await asyncio.sleep(e.retry_after)
+                error = e
+            except (TelegramNetworkError, TelegramServerError) as e:
+                await asyncio.sleep(2 ** attempt)
+                error = e
+            except TelegramForbiddenError:
+                report.blocked += 1
+                return STATUS_BLOCKED
+            except Exception as e:
+                print(f"Ошибка рассылки в чат {chat_id}: {e}")
+                report.failed += 1
+                return STATUS_FAILED
+
+            if attempt < self.max_retries:
+                report.retries += 1
+
+        print(f"Ошибка рассылки в чат {chat_id}: {error}")
+        report.failed += 1
+        return STATUS_FAILED
@@ -6,3 +6,79 @@ config = dotenv_values('./config/.env')
 API_TOKEN = config['TOKEN']
 SQLALCHEMY_URL = config['SQLALCHEMY_URL']
 ADMIN_ID = int(config.get("ADMIN_ID", "0"))
+# Множество ID администраторов для проверок роли без преобразований
+ADMIN_IDS = frozenset({ADMIN_ID})
+
+# Вывод всех SQL-запросов SQLAlchemy (только для отладки)
+SQL_ECHO = config.get("SQL_ECHO", "false").lower() == "true"
+
+# Журнал запросов: доля записываемых запросов (0..1), порог медленного
+# запроса в мс (такие пишутся всегда, 0 — выключено) и файл журнала
+QUERY_LOG_SAMPLE_RATE = float(config.get("QUERY_LOG_SAMPLE_RATE", "0"))
+QUERY_LOG_SLOW_MS = float(config.get("QUERY_LOG_SLOW_MS", "200"))
+QUERY_LOG_FILE = config.get("QUERY_LOG_FILE", "")
+
+# Пул соединений для чтения и настройки SQLite (PRAGMA при подключении)
+DB_POOL_SIZE = int(config.get("DB_POOL_SIZE", "5"))
+SQLITE_BUSY_TIMEOUT = int(config.get("SQLITE_BUSY_TIMEOUT", "5000"))  # мс
+SQLITE_CACHE_SIZE_KB = int(config.get("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(config.get("SQLITE_MMAP_SIZE", "268435456"))  # байт
+
+# Сколько пользователей удалять одним запросом при массовом удалении
+DELETE_CHUNK_SIZE = int(config.get("DELETE_CHUNK_SIZE", "1000"))
+
+# Как часто проверять изменения файлов переводов (секунды, 0 — не проверять)
+LOCALE_RELOAD_INTERVAL = float(config.get("LOCALE_RELOAD_INTERVAL", "5"))
+
+# Кеш языков пользователей (Telegram ID → язык)
+LANGUAGE_CACHE_SIZE = int(config.get("LANGUAGE_CACHE_SIZE", "10000"))
+LANGUAGE_CACHE_TTL = int(config.get("LANGUAGE_CACHE_TTL", "3600"))
+
+# Кеш готового каталога и карточек курсов; сбрасывается при изменении курсов,
+# TTL ограничивает устаревание в других процессах (SHARD_WORKERS)
+COURSE_CACHE_TTL = int(config.get("COURSE_CACHE_TTL", "300"))
+COURSE_CARD_CACHE_SIZE = int(config.get("COURSE_CARD_CACHE_SIZE", "1024"))
+
+# Хранилище FSM: memory, sql (таблица в основной БД) или redis
+FSM_STORAGE = config.get("FSM_STORAGE", "sql")
+FSM_REDIS_URL = config.get("FSM_REDIS_URL", "redis://localhost:6379/0")
+FSM_TTL = int(config.get("FSM_TTL", "86400"))
+FSM_FLUSH_INTERVAL = float(config.get("FSM_FLUSH_INTERVAL", "1"))
+FSM_CACHE_SIZE = int(config.get("FSM_CACHE_SIZE", "5000"))
+
+# Ограничение частоты апдейтов от пользователя: апдейтов в секунду
+# (0 — без ограничения), допустимый всплеск, хранилище вёдер
+# (memory или redis — общее для нескольких инстансов)
+THROTTLE_RATE = float(config.get("THROTTLE_RATE", "1"))
+THROTTLE_BURST = int(config.get("THROTTLE_BURST", "5"))
+THROTTLE_STORAGE = config.get("THROTTLE_STORAGE", "memory")
+THROTTLE_REDIS_URL = config.get("THROTTLE_REDIS_URL", FSM_REDIS_URL)
+THROTTLE_CACHE_SIZE = int(config.get("THROTTLE_CACHE_SIZE", "10000"))
+
+# Режим получения апдейтов: polling или webhook
+BOT_MODE = config.get("BOT_MODE", "polling")
+DROP_PENDING_UPDATES = config.get("DROP_PENDING_UPDATES", "false").lower() == "true"
+
+# Webhook: публичный адрес, локальный сервер aiohttp и секрет Telegram
+WEBHOOK_URL = config.get("WEBHOOK_URL", "")
+WEBHOOK_HOST = config.get("WEBHOOK_HOST", "0.0.0.0")
+WEBHOOK_PORT = int(config.get("WEBHOOK_PORT", "8080"))
+WEBHOOK_PATH = config.get("WEBHOOK_PATH", "/webhook")
+WEBHOOK_SECRET = config.get("WEBHOOK_SECRET", "")
+
+# Очередь апдейтов и пул обработчиков
+UPDATE_QUEUE_SIZE = int(config.get("UPDATE_QUEUE_SIZE", "1000"))
+UPDATE_WORKERS = int(config.get("UPDATE_WORKERS", "8"))
+
+# Количество процессов-обработчиков (0 или 1 — всё в одном процессе)
+SHARD_WORKERS = int(config.get("SHARD_WORKERS", "0"))
+
+# Очередь исходящих запросов: общий лимит запросов в секунду (0 — без очереди).
+# При SHARD_WORKERS > 1 делится поровну между главным процессом и обработчиками
+OUTBOX_RATE = float(config.get("OUTBOX_RATE", "30"))
+
+# Рассылки: сообщений в секунду (лимит Telegram ~30, 0 — без ограничения),
+# параллельность, повторы
+BROADCAST_RATE = float(config.get("BROADCAST_RATE", "25"))
+BROADCAST_CONCURRENCY = int(config.get("BROADCAST_CONCURRENCY", "10"))
+BROADCAST_RETRIES = int(config.get("BROADCAST_RETRIES", "3"))
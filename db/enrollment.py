@@ -0,0 +1,232 @@
+"""
+Запись на курсы с учётом мест и листа ожидания.
+
+Занятые места считаются в courses.seats_taken. Место занимается
+атомарным UPDATE ... WHERE seats_taken < capacity, поэтому даже при
+одновременных нажатиях курс не переполняется. Когда мест нет,
+пользователь встаёт в лист ожидания, а при освобождении места
+первый в очереди записывается автоматически.
+
+Функции выполняются в транзакции переданной сессии записи;
+фиксирует транзакцию вызывающий код.
+"""
+from datetime import date, datetime
+
+from sqlalchemy import (
+    Date,
+    String,
+    delete,
+    false,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    update
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Course, Enrollment, User, WaitlistEntry
+from db.session import dialect_insert
+
+
+def insert_enrollment(course_id: int, *user_filter):
+    """
+    Построить INSERT записи на курс с датами курса.
+
+    INSERT ... SELECT FROM users JOIN courses ON CONFLICT DO NOTHING
+    RETURNING название курса: строка не возвращается, если
+    пользователь или курс не найдены либо запись уже существует.
+
+    Args:
+        course_id: ID курса
+        *user_filter: Условия выбора пользователя
+
+    Returns:
+        Конструкция INSERT
+    """
+    # SQLAlchemy не умеет коррелировать подзапрос в RETURNING,
+    # поэтому название курса берётся подзапросом в виде текста
+    course_title = literal_column(
+        "(SELECT courses.title FROM courses"
+        " WHERE courses.id = enrollments.course_id)",
+        String
+    )
+    return (
+        dialect_insert(Enrollment)
+        .from_select(
+            ["user_id", "course_id", "start_date", "end_date", "is_completed"],
+            select(
+                User.id,
+                Course.id,
+                func.coalesce(Course.start_date, literal(date.today(), Date)),
+                Course.end_date,
+                false()
+            )
+            .select_from(User)
+            .join(Course, Course.id == course_id)
+            .where(*user_filter)
+        )
+        .on_conflict_do_nothing(index_elements=["user_id", "course_id"])
+        .returning(course_title)
+    )
+
+
+async def reserve_seat(session: AsyncSession, course_id: int) -> bool:
+    """
+    Занять место на курсе, если оно есть.
+
+    Args:
+        session: Сессия записи
+        course_id: ID курса
+
+    Returns:
+        True, если место занято
+    """
+    result = await session.execute(
+        update(Course)
+        .where(
+            Course.id == course_id,
+            or_(
+                Course.capacity.is_(None),
+                Course.seats_taken < Course.capacity
+            )
+        )
+        .values(seats_taken=Course.seats_taken + 1)
+        .returning(Course.id)
+    )
+    return result.scalar_one_or_none() is not None
+
+
+async def release_seat(session: AsyncSession, course_id: int) -> None:
+    """
+    Освободить место на курсе.
+
+    Args:
+        session: Сессия записи
+        course_id: ID курса
+    """
+    await session.execute(
+        update(Course)
+        .where(Course.id == course_id, Course.seats_taken > 0)
+        .values(seats_taken=Course.seats_taken - 1)
+    )
+
+
+async def recount_seats(
+    session: AsyncSession,
+    course_ids: list[int] | None = None
+) -> None:
+    """
+    Пересчитать занятые места по записям на курсы.
+
+    Нужно после удаления пользователей, когда записи удаляются
+    каскадом в обход счётчика.
+
+    Args:
+        session: Сессия записи
+        course_ids: ID курсов; None — все курсы
+    """
+    statement = update(Course).values(
+        seats_taken=select(func.count())
+        .where(Enrollment.course_id == Course.id)
+        .scalar_subquery()
+    )
+    if course_ids is not None:
+        statement = statement.where(Course.id.in_(course_ids))
+    await session.execute(statement)
+
+
+async def join_waitlist(
+    session: AsyncSession,
+    course_id: int,
+    telegram_id: int
+) -> bool:
+    """
+    Поставить пользователя в лист ожидания курса.
+
+    Args:
+        session: Сессия записи
+        course_id: ID курса
+        telegram_id: Telegram ID пользователя
+
+    Returns:
+        False, если пользователь уже в листе ожидания
+    """
+    result = await session.execute(
+        dialect_insert(WaitlistEntry)
+        .from_select(
+            ["course_id", "user_id", "created_at"],
+            select(
+                literal(course_id),
+                User.id,
+                literal(datetime.now())
+            ).where(User.user_id == telegram_id)
+        )
+        .on_conflict_do_nothing(index_elements=["course_id", "user_id"])
+        .returning(WaitlistEntry.id)
+    )
+    return result.scalar_one_or_none() is not None
+
+
+async def promote_waitlist(
+    session: AsyncSession,
+    course_id: int
+) -> list[tuple[int, str, str]]:
+    """
+    Записать на курс пользователей из листа ожидания, пока есть места.
+
+    Очередной пользователь забирается из очереди DELETE ... RETURNING
+    (в PostgreSQL с SKIP LOCKED), поэтому параллельные отписки
+    не продвигают одного и того же человека дважды.
+
+    Args:
+        session: Сессия записи
+        course_id: ID курса
+
+    Returns:
+        Список (Telegram ID, язык, название курса) записанных
+        пользователей — для уведомления после фиксации транзакции
+    """
+    promoted = []
+
+    while await reserve_seat(session, course_id):
+        next_entry = (
+            select(WaitlistEntry.id)
+            .where(WaitlistEntry.course_id == course_id)
+            .order_by(WaitlistEntry.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        user_id = (
+            await session.execute(
+                delete(WaitlistEntry)
+                .where(WaitlistEntry.id == next_entry)
+                .returning(WaitlistEntry.user_id)
+            )
+        ).scalar_one_or_none()
+
+        if user_id is None:
+            await release_seat(session, course_id)
+            break
+
+        title = (
+            await session.execute(
+                insert_enrollment(course_id, User.id == user_id)
+            )
+        ).scalar_one_or_none()
+        if title is None:
+            # Пользователь уже записан — место достаётся следующему
+            await release_seat(session, course_id)
+            continue
+
+        telegram_id, language = (
+            await session.execute(
+                select(User.user_id, User.language).where(User.id == user_id)
+            )
+        ).one()
+        if telegram_id:
+            promoted.append((telegram_id, language or "ru", title))
+
+    return promoted
@@ -0,0 +1,157 @@
+"""
+Миграции схемы БД.
+
+create_all создаёт только отсутствующие таблицы и не меняет
+существующие, поэтому изменения схемы уже созданной БД (новые
+индексы, столбцы) оформляются здесь пронумерованными шагами.
+Номер последнего применённого шага хранится в таблице schema_version.
+
+Шаги должны быть идемпотентными: на новой БД create_all уже создал
+актуальную схему, и шаги только отмечаются применёнными.
+"""
+from collections.abc import Callable
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    Integer,
+    MetaData,
+    Table,
+    delete,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
+    update
+)
+
+from db.models import Certificate, Course, Enrollment, User
+
+metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    metadata,
+    Column("version", Integer, primary_key=True)
+)
+
+
+def _index_names(conn: Connection, table: Table) -> set[str]:
+    """
+    Имена существующих индексов таблицы.
+
+    SQLite не отражает индексы по выражениям (lower(name)) через
+    inspect(), поэтому для него имена читаются из sqlite_master.
+    """
+    if conn.dialect.name == "sqlite":
+        return set(
+            conn.execute(
+                text(
+                    "SELECT name FROM sqlite_master "
+                    "WHERE type = 'index' AND tbl_name = :table"
+                ),
+                {"table": table.name}
+            ).scalars()
+        )
+    return {index["name"] for index in inspect(conn).get_indexes(table.name)}
+
+
+def _create_indexes(conn: Connection, *tables: Table) -> None:
+    """Создать недостающие индексы таблиц."""
+    for table in tables:
+        existing = _index_names(conn, table)
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(conn)
+
+
+def _add_column(conn: Connection, table: Table, name: str) -> None:
+    """Добавить в таблицу столбец из модели, если его ещё нет."""
+    existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+    if name in existing:
+        return
+
+    column = table.c[name]
+    ddl = f"ALTER TABLE {table.name} ADD COLUMN {name} {column.type.compile(conn.dialect)}"
+    if column.server_default is not None:
+        ddl += f" NOT NULL DEFAULT {column.server_default.arg}"
+    conn.execute(text(ddl))
+
+
+def add_lookup_indexes(conn: Connection) -> None:
+    """
+    Индексы для выборок по записям на курсы и сертификатам.
+
+    Перед созданием уникального индекса (user_id, course_id)
+    удаляются повторные записи на один и тот же курс.
+    """
+    enrollments = Enrollment.__table__
+    first_ids = (
+        select(func.min(enrollments.c.id))
+        .group_by(enrollments.c.user_id, enrollments.c.course_id)
+    )
+    conn.execute(delete(enrollments).where(enrollments.c.id.not_in(first_ids)))
+
+    _create_indexes(conn, enrollments, Certificate.__table__)
+
+
+def add_course_capacity(conn: Connection) -> None:
+    """
+    Вместимость курса и счётчик занятых мест.
+
+    Счётчик заполняется по существующим записям на курсы.
+    """
+    courses = Course.__table__
+    enrollments = Enrollment.__table__
+    _add_column(conn, courses, "capacity")
+    _add_column(conn, courses, "seats_taken")
+
+    conn.execute(
+        update(courses).values(
+            seats_taken=select(func.count())
+            .where(enrollments.c.course_id == courses.c.id)
+            .scalar_subquery()
+        )
+    )
+
+
+def add_user_name_index(conn: Connection) -> None:
+    """Индекс для поиска пользователей по началу имени."""
+    _create_indexes(conn, User.__table__)
+
+
+def add_user_name_lower_index(conn: Connection) -> None:
+    """Индекс по lower(name) вместо индекса по имени с учётом регистра."""
+    conn.execute(text("DROP INDEX IF EXISTS ix_users_name"))
+    _create_indexes(conn, User.__table__)
+
+
+# (версия, шаг) — новые шаги добавляются в конец
+MIGRATIONS: list[tuple[int, Callable[[Connection], None]]] = [
+    (1, add_lookup_indexes),
+    (2, add_course_capacity),
+    (3, add_user_name_index),
+    (4, add_user_name_lower_index),
+]
+
+
+def migrate(conn: Connection) -> None:
+    """
+    Применить неприменённые миграции.
+
+    Вызывается через AsyncConnection.run_sync внутри транзакции
+    create_db.
+
+    Args:
+        conn: Синхронное соединение с БД
+    """
+    metadata.create_all(conn)
+    current = conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+    for version, step in MIGRATIONS:
+        if version <= current:
+            continue
+        step(conn)
+        conn.execute(insert(schema_version).values(version=version))
+        print(f"Применена миграция БД {version}: {step.__name__}")
@@ -1,13 +1,17 @@
 from sqlalchemy.orm import Mapped, DeclarativeBase, mapped_column, relationship
-from sqlalchemy import String, Integer, ForeignKey, Date, Boolean, Text, select
+from sqlalchemy import String, Integer, BigInteger, ForeignKey, Date, DateTime, Boolean, Text, Index, UniqueConstraint, select, text
 from sqlalchemy.ext.asyncio import AsyncAttrs
-from db.session import async_session
+from db.session import async_write_session
 
 class Base(AsyncAttrs, DeclarativeBase):
     pass
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Поиск по началу имени без учёта регистра (см. user_search_filter)
+        Index("ix_users_name_lower", text("lower(name)")),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int | None] = mapped_column(Integer, unique=True, nullable=True)
@@ -27,6 +31,10 @@ class User(Base):
         back_populates="user",
         cascade="all, delete-orphan"
     )
+    waitlist_entries: Mapped[list["WaitlistEntry"]] = relationship(
+        back_populates="user",
+        cascade="all, delete-orphan"
+    )
 
 class Course(Base):
     __tablename__ = "courses"
@@ -37,14 +45,26 @@ class Course(Base):
     price: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     start_date: Mapped[Date] = mapped_column(Date, nullable=True)
     end_date: Mapped[Date] = mapped_column(Date, nullable=True)
+    capacity: Mapped[int | None] = mapped_column(Integer, nullable=True)  # None — без ограничений
+    seats_taken: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     enrollments: Mapped[list["Enrollment"]] = relationship(
         back_populates="course",
         cascade="all, delete-orphan"
     )
+    waitlist_entries: Mapped[list["WaitlistEntry"]] = relationship(
+        back_populates="course",
+        cascade="all, delete-orphan"
+    )
 
 class Enrollment(Base):
     __tablename__ = "enrollments"
+    __table_args__ = (
+        Index("ix_enrollments_user_course", "user_id", "course_id", unique=True),
+        Index("ix_enrollments_course_id", "course_id"),
+        Index("ix_enrollments_start_date", "start_date"),
+        Index("ix_enrollments_end_date", "end_date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
@@ -58,6 +78,9 @@ class Enrollment(Base):
 
 class Certificate(Base):
     __tablename__ = "certificates"
+    __table_args__ = (
+        Index("ix_certificates_user_id", "user_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
@@ -65,15 +88,54 @@ class Certificate(Base):
     file_id: Mapped[str] = mapped_column(String(255), nullable=True)
     user: Mapped["User"] = relationship(back_populates="certificates")
 
-# Создание таблиц
+class WaitlistEntry(Base):
+    __tablename__ = "waitlist"
+    __table_args__ = (
+        UniqueConstraint("course_id", "user_id", name="uq_waitlist_course_user"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)  # Порядок очереди
+    course_id: Mapped[int] = mapped_column(ForeignKey("courses.id", ondelete="CASCADE"))
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    created_at: Mapped[DateTime] = mapped_column(DateTime)
+
+    user: Mapped["User"] = relationship(back_populates="waitlist_entries")
+    course: Mapped["Course"] = relationship(back_populates="waitlist_entries")
+
+class NotificationLog(Base):
+    __tablename__ = "notification_log"
+    __table_args__ = (
+        UniqueConstraint("enrollment_id", "kind", "date", name="uq_notification_log_enrollment_kind_date"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    enrollment_id: Mapped[int] = mapped_column(ForeignKey("enrollments.id", ondelete="CASCADE"))
+    kind: Mapped[str] = mapped_column(String(20))  # course_start / course_end
+    date: Mapped[Date] = mapped_column(Date)
+    status: Mapped[str] = mapped_column(String(20), default="pending")  # pending / sent / failed / blocked
+    claim_token: Mapped[str] = mapped_column(String(32), nullable=True)
+    claimed_at: Mapped[DateTime] = mapped_column(DateTime, nullable=True)
+
+class FSMRecord(Base):
+    __tablename__ = "fsm_records"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    state: Mapped[str] = mapped_column(String(255), nullable=True)
+    data: Mapped[str] = mapped_column(Text, nullable=True)
+    expires_at: Mapped[int] = mapped_column(BigInteger, index=True)  # Unix-время истечения
+
+# Создание таблиц и миграция существующей БД
 async def create_db(engine):
+    from db.migrations import migrate
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(migrate)
 
 # Сидинг курсов
 async def seed_courses():
     from datetime import date
-    async with async_session() as session:
+    async with async_write_session() as session:
         result = await session.execute(select(Course))
         courses = result.scalars().all()
         if not courses:
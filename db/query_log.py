@@ -0,0 +1,112 @@
+"""
+Журнал SQL-запросов.
+
+Вместо echo=True, который печатает каждый запрос, записывает
+в журнал только медленные запросы и случайную выборку остальных.
+Каждая запись — одна JSON-строка с текстом запроса, длительностью
+и количеством строк.
+"""
+import json
+import logging
+import random
+import re
+import sys
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from config.bot_config import (
+    QUERY_LOG_SAMPLE_RATE,
+    QUERY_LOG_SLOW_MS,
+    QUERY_LOG_FILE
+)
+
+# Максимальная длина текста запроса в журнале
+MAX_STATEMENT_LENGTH = 1000
+
+_WHITESPACE = re.compile(r"\s+")
+
+logger = logging.getLogger("db.queries")
+
+
+def _setup_logger() -> None:
+    """Направить журнал в файл QUERY_LOG_FILE или в stdout."""
+    if logger.handlers:
+        return
+
+    handler = (
+        logging.FileHandler(QUERY_LOG_FILE, encoding="utf-8")
+        if QUERY_LOG_FILE
+        else logging.StreamHandler(sys.stdout)
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Время старта по контексту выполнения: его же получает handle_error
+    conn.info.setdefault("query_started", {})[id(context)] = time.perf_counter()
+
+
+def _handle_error(exception_context) -> None:
+    """Забыть время старта упавшего запроса, чтобы записи не копились в соединении."""
+    conn = exception_context.connection
+    if conn is not None:
+        conn.info.get("query_started", {}).pop(
+            id(exception_context.execution_context),
+            None
+        )
+
+
+def _row_count(cursor) -> int | None:
+    """
+    Количество строк запроса по cursor.rowcount (DB-API).
+
+    Для INSERT/UPDATE/DELETE — число затронутых строк. Для SELECT
+    и запросов с RETURNING драйвер может не знать числа строк до их
+    чтения: sqlite3/aiosqlite возвращают -1, и тогда в журнале null;
+    asyncpg сообщает число выбранных строк.
+    """
+    return cursor.rowcount if cursor.rowcount >= 0 else None
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_started"].pop(id(context))
+    duration_ms = (time.perf_counter() - started) * 1000
+    slow = QUERY_LOG_SLOW_MS > 0 and duration_ms >= QUERY_LOG_SLOW_MS
+
+    if not slow and random.random() >= QUERY_LOG_SAMPLE_RATE:
+        return
+
+    record: dict[str, Any] = {
+        "ts": round(time.time(), 3),
+        "statement": _WHITESPACE.sub(" ", statement).strip()[:MAX_STATEMENT_LENGTH],
+        "duration_ms": round(duration_ms, 2),
+        "rows": _row_count(cursor),
+        "executemany": executemany,
+        "slow": slow
+    }
+    logger.info(json.dumps(record, ensure_ascii=False))
+
+
+def setup_query_log(engine: AsyncEngine) -> None:
+    """
+    Подключить журнал запросов к движку.
+
+    Если выборка и порог медленных запросов выключены,
+    обработчики событий не регистрируются вовсе.
+
+    Args:
+        engine: Асинхронный движок SQLAlchemy
+    """
+    if QUERY_LOG_SAMPLE_RATE <= 0 and QUERY_LOG_SLOW_MS <= 0:
+        return
+
+    _setup_logger()
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
@@ -1,5 +1,95 @@
-from config.bot_config import SQLALCHEMY_URL
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from config.bot_config import (
+    SQLALCHEMY_URL,
+    SQL_ECHO,
+    DB_POOL_SIZE,
+    SQLITE_BUSY_TIMEOUT,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_MMAP_SIZE
+)
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
+
+from db.query_log import setup_query_log
+
+_url = make_url(SQLALCHEMY_URL)
+IS_SQLITE = _url.get_backend_name() == "sqlite"
+# Для базы в памяти у каждого соединения своя БД — второй движок недопустим
+_IS_SQLITE_FILE = IS_SQLITE and _url.database not in (None, "", ":memory:")
+
+
+def _unicode_lower(value):
+    """lower() для SQLite с учётом не только ASCII (кириллица и др.)."""
+    return value.lower() if isinstance(value, str) else value
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Настроить новое соединение SQLite.
+
+    WAL позволяет читать параллельно с записью, synchronous=NORMAL
+    в режиме WAL безопасен и не делает fsync на каждый коммит,
+    busy_timeout ждёт освобождения блокировки вместо ошибки.
+    foreign_keys включает ON DELETE CASCADE у внешних ключей.
+    Встроенный lower() меняет регистр только у латиницы, поэтому
+    подменяется на Python-версию (детерминированную — она участвует
+    в индексе ix_users_name_lower).
+    """
+    dbapi_connection.create_function(
+        "lower",
+        1,
+        _unicode_lower,
+        deterministic=True
+    )
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.close()
+
+
+def _create_engine(**kwargs) -> AsyncEngine:
+    """Создать движок с настройками SQLite и журналом запросов."""
+    new_engine = create_async_engine(SQLALCHEMY_URL, echo=SQL_ECHO, **kwargs)
+    if IS_SQLITE:
+        event.listen(new_engine.sync_engine, "connect", _sqlite_pragmas)
+    setup_query_log(new_engine)
+    return new_engine
+
+
+# Движок для чтения: пул соединений
+engine = _create_engine(**({"pool_size": DB_POOL_SIZE} if _IS_SQLITE_FILE else {}))
+
+# SQLite допускает одного писателя: все записи идут через одно соединение
+# и выстраиваются в очередь пула, а не конкурируют за блокировку файла.
+# Для остальных СУБД пишем через общий пул.
+write_engine = (
+    _create_engine(pool_size=1, max_overflow=0)
+    if _IS_SQLITE_FILE
+    else engine
+)
 
-engine = create_async_engine(SQLALCHEMY_URL, echo=True)
 async_session = async_sessionmaker(engine, expire_on_commit=False)
+async_write_session = async_sessionmaker(write_engine, expire_on_commit=False)
+
+
+def dialect_insert(table):
+    """
+    Получить insert() диалекта текущей БД.
+
+    В отличие от общего insert(), поддерживает
+    on_conflict_do_nothing() и on_conflict_do_update().
+
+    Args:
+        table: Модель или таблица
+
+    Returns:
+        Конструкция INSERT для PostgreSQL или SQLite
+    """
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
@@ -0,0 +1,321 @@
+"""
+Хранилища FSM с ограничением времени жизни состояний.
+
+SQLStorage держит горячие записи в ограниченном LRU-кеше и пакетно
+сбрасывает изменения в таблицу fsm_records основной БД, поэтому
+незавершённые сценарии переживают перезапуск бота. Для нескольких
+инстансов можно использовать Redis-хранилище aiogram.
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Mapping
+
+from aiogram.exceptions import DataNotDictLikeError
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import (
+    BaseStorage,
+    DefaultKeyBuilder,
+    KeyBuilder,
+    StateType,
+    StorageKey
+)
+from aiogram.fsm.storage.memory import MemoryStorage
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from config.bot_config import (
+    FSM_STORAGE,
+    FSM_REDIS_URL,
+    FSM_TTL,
+    FSM_FLUSH_INTERVAL,
+    FSM_CACHE_SIZE
+)
+from db.models import FSMRecord
+from db.session import async_session, async_write_session
+
+# Раз в сколько секунд удалять из БД истёкшие записи
+PURGE_INTERVAL = 600
+
+# Максимум ключей в одном IN (...) — ограничение SQLite на параметры
+FLUSH_CHUNK_SIZE = 500
+
+
+def _json_default(value: Any) -> Any:
+    """Сериализовать даты, которые сценарии кладут в данные FSM."""
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(
+        f"Object of type {type(value).__name__} is not JSON serializable"
+    )
+
+
+def _json_object_hook(value: dict[str, Any]) -> Any:
+    """Восстановить даты, сохранённые через _json_default."""
+    if "__datetime__" in value:
+        return datetime.fromisoformat(value["__datetime__"])
+    if "__date__" in value:
+        return date.fromisoformat(value["__date__"])
+    return value
+
+
+def json_dumps(data: Any) -> str:
+    """
+    Сериализовать данные FSM в JSON с поддержкой date/datetime.
+
+    Args:
+        data: Данные FSM
+
+    Returns:
+        JSON-строка
+    """
+    return json.dumps(data, default=_json_default, ensure_ascii=False)
+
+
+def json_loads(raw: str | bytes) -> Any:
+    """
+    Десериализовать данные FSM, сохранённые через json_dumps.
+
+    Args:
+        raw: JSON-строка
+
+    Returns:
+        Данные FSM
+    """
+    return json.loads(raw, object_hook=_json_object_hook)
+
+
+@dataclass
+class _Record:
+    """Запись FSM в кеше хранилища."""
+
+    state: str | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+    expires_at: float = 0
+    dirty: bool = False
+
+    def is_empty(self) -> bool:
+        return self.state is None and not self.data
+
+
+class SQLStorage(BaseStorage):
+    """
+    FSM-хранилище в таблице fsm_records.
+
+    - Записи живут ttl секунд с момента последнего изменения.
+    - Изменения копятся в памяти и сбрасываются в БД одной транзакцией
+      раз в flush_interval секунд (и при остановке бота).
+    - В памяти держится не более max_cached записей; при переполнении
+      вытесняются самые давно использованные.
+
+    Args:
+        session_maker: Фабрика сессий для записи (сброс изменений)
+        read_session_maker: Фабрика сессий для чтения при промахе кеша
+        ttl: Время жизни состояния в секундах
+        flush_interval: Период пакетной записи в БД в секундах
+        max_cached: Максимум записей в памяти
+        key_builder: Построитель строковых ключей
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker = async_write_session,
+        read_session_maker: async_sessionmaker = async_session,
+        ttl: int = FSM_TTL,
+        flush_interval: float = FSM_FLUSH_INTERVAL,
+        max_cached: int = FSM_CACHE_SIZE,
+        key_builder: KeyBuilder | None = None
+    ) -> None:
+        self.session_maker = session_maker
+        self.read_session_maker = read_session_maker
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.max_cached = max_cached
+        self.key_builder = key_builder or DefaultKeyBuilder()
+        self._cache: OrderedDict[str, _Record] = OrderedDict()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self._next_purge = 0.0
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = await self._get_record(key)
+        record.state = state.state if isinstance(state, State) else state
+        self._touch(record)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        record = await self._get_record(key)
+        return record.state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            msg = f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            raise DataNotDictLikeError(msg)
+
+        record = await self._get_record(key)
+        record.data = deepcopy(data)
+        self._touch(record)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        record = await self._get_record(key)
+        return deepcopy(record.data)
+
+    async def close(self) -> None:
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Записать в БД все изменённые записи одной транзакцией."""
+        async with self._flush_lock:
+            now = time.time()
+            dirty = [
+                (key, record)
+                for key, record in self._cache.items()
+                if record.dirty
+            ]
+            purge = now >= self._next_purge
+
+            if not dirty and not purge:
+                return
+
+            for _, record in dirty:
+                record.dirty = False
+
+            # Сериализуем до транзакции: запись с несериализуемыми данными
+            # пропускается (в БД остаётся её прежняя версия) и не мешает
+            # сохранению остальных
+            prepared = []
+            for key, record in dirty:
+                row = None
+                if not record.is_empty():
+                    try:
+                        row = {
+                            "key": key,
+                            "state": record.state,
+                            "data": json_dumps(record.data),
+                            "expires_at": int(record.expires_at)
+                        }
+                    except (TypeError, ValueError) as e:
+                        print(f"Ошибка сериализации состояния FSM {key}: {e}")
+                        continue
+                prepared.append((key, record, row))
+
+            try:
+                async with self.session_maker() as session:
+                    for start in range(0, len(prepared), FLUSH_CHUNK_SIZE):
+                        chunk = prepared[start:start + FLUSH_CHUNK_SIZE]
+                        await session.execute(
+                            delete(FSMRecord).where(
+                                FSMRecord.key.in_([key for key, _, _ in chunk])
+                            )
+                        )
+                        rows = [row for _, _, row in chunk if row is not None]
+                        if rows:
+                            await session.execute(insert(FSMRecord), rows)
+
+                    if purge:
+                        await session.execute(
+                            delete(FSMRecord).where(
+                                FSMRecord.expires_at < now
+                            )
+                        )
+                    await session.commit()
+            except Exception as e:
+                for _, record, _ in prepared:
+                    record.dirty = True
+                print(f"Ошибка при сохранении состояний FSM: {e}")
+                return
+
+            if purge:
+                self._next_purge = now + PURGE_INTERVAL
+                for key in [
+                    key for key, record in self._cache.items()
+                    if record.expires_at and record.expires_at < now
+                ]:
+                    del self._cache[key]
+
+    async def _get_record(self, key: StorageKey) -> _Record:
+        """Получить запись из кеша или загрузить её из БД."""
+        str_key = self.key_builder.build(key)
+        record = self._cache.get(str_key)
+
+        if record is not None:
+            if record.expires_at and record.expires_at < time.time():
+                record = _Record()
+                self._cache[str_key] = record
+            self._cache.move_to_end(str_key)
+            return record
+
+        record = _Record()
+        async with self.read_session_maker() as session:
+            row = await session.get(FSMRecord, str_key)
+            if row and row.expires_at > time.time():
+                record = _Record(
+                    state=row.state,
+                    data=json_loads(row.data) if row.data else {},
+                    expires_at=row.expires_at
+                )
+
+        # Запись могли создать, пока шёл запрос к БД
+        record = self._cache.setdefault(str_key, record)
+        self._cache.move_to_end(str_key)
+        await self._shrink()
+        return record
+
+    def _touch(self, record: _Record) -> None:
+        """Пометить запись изменённой и продлить её TTL."""
+        record.expires_at = time.time() + self.ttl
+        record.dirty = True
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Периодически сбрасывать изменения в БД."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def _shrink(self) -> None:
+        """Вытеснить старые записи, если кеш превысил лимит."""
+        while len(self._cache) > self.max_cached:
+            key, record = next(iter(self._cache.items()))
+            if record.dirty:
+                await self.flush()
+                if record.dirty:
+                    break
+            self._cache.pop(key, None)
+
+
+def create_storage() -> BaseStorage:
+    """
+    Создать FSM-хранилище согласно настройке FSM_STORAGE.
+
+    Для redis нужен пакет redis; вместо реального сервера подойдёт
+    любой совместимый по протоколу (например, локальный заменитель
+    для тестов).
+
+    Returns:
+        Экземпляр хранилища FSM
+    """
+    if FSM_STORAGE == "memory":
+        return MemoryStorage()
+
+    if FSM_STORAGE == "redis":
+        from aiogram.fsm.storage.redis import RedisStorage
+
+        return RedisStorage.from_url(
+            FSM_REDIS_URL,
+            state_ttl=FSM_TTL,
+            data_ttl=FSM_TTL,
+            json_loads=json_loads,
+            json_dumps=json_dumps
+        )
+
+    return SQLStorage()
@@ -4,7 +4,8 @@
 """
 from datetime import datetime
 
-from aiogram import Router, F
+from aiogram import Router, F, html
+from aiogram.filters import Command
 from aiogram.types import (
     InlineKeyboardMarkup,
     InlineKeyboardButton,
@@ -14,33 +15,30 @@ from aiogram.types import (
 from aiogram.enums import ContentType
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import StatesGroup, State
-from sqlalchemy import select
+from sqlalchemy import and_, delete, func, or_, select
 
-from db.models import User, Course, Certificate
-from db.session import async_session
-from config.bot_config import ADMIN_ID
+from db.models import User, Course, Certificate, Enrollment, WaitlistEntry
+from db.session import async_session, async_write_session
+from config.bot_config import ADMIN_ID, DELETE_CHUNK_SIZE
 from keyboards.reply import admin_main_keyboard, admin_back_keyboard
 from i18n.locales import get_text, MIN_CERTIFICATE_TITLE_LENGTH
+from i18n.menu import MenuButton
+from middlewares.user_context import language_cache
+from handlers.courses import card_cache, catalog_cache, invalidate_course_cache
+from db.enrollment import promote_waitlist, recount_seats
+from notifier import notify_waitlist_promoted
+from utils.pagination import (
+    keyset_query,
+    navigation_row,
+    parse_page_callback,
+    split_page
+)
 
 admin_router = Router()
 
-
-async def get_user_language(user_id: int) -> str:
-    """
-    Получить язык пользователя из БД.
-
-    Args:
-        user_id: Telegram ID пользователя
-
-    Returns:
-        Код языка (ru/en/uz), по умолчанию 'ru'
-    """
-    async with async_session() as session:
-        result = await session.execute(
-            select(User).where(User.user_id == user_id)
-        )
-        user = result.scalar_one_or_none()
-        return user.language if user and user.language else "ru"
+# Сколько пользователей показывать на одной странице
+USERS_PAGE_SIZE = 10
+CERT_PICKER_PAGE_SIZE = 8
 
 
 # ============ FSM классы ============
@@ -52,6 +50,7 @@ class AddCourseFSM(StatesGroup):
     price = State()
     start_date = State()
     end_date = State()
+    capacity = State()
 
 
 class EditCourseFSM(StatesGroup):
@@ -63,6 +62,7 @@ class EditCourseFSM(StatesGroup):
     price = State()
     start_date = State()
     end_date = State()
+    capacity = State()
 
 
 class CertificateFSM(StatesGroup):
@@ -74,26 +74,19 @@ class CertificateFSM(StatesGroup):
 
 
 # ============ Админ-меню ============
-@admin_router.message(
-    F.text.in_([
-        "Управление курсами и пользователями",
-        "Manage Courses and Users",
-        "Kurs va foydalanuvchilarni boshqarish"
-    ])
-)
-async def admin_main_menu(message: Message) -> None:
+@admin_router.message(MenuButton("btn_admin_panel"))
+async def admin_main_menu(message: Message, lang: str) -> None:
     """
     Показать главное меню администратора.
 
     Args:
         message: Входящее сообщение
+        lang: Код языка пользователя
     """
     if message.from_user.id != ADMIN_ID:
-        lang = await get_user_language(message.from_user.id)
         await message.answer(get_text("no_access", lang))
         return
 
-    lang = await get_user_language(message.from_user.id)
     await message.answer(
         get_text("admin_main_menu", lang),
         reply_markup=admin_main_keyboard(lang)
@@ -103,7 +96,8 @@ async def admin_main_menu(message: Message) -> None:
 @admin_router.callback_query(F.data == "admin_menu")
 async def back_to_admin_menu(
     callback: CallbackQuery,
-    state: FSMContext
+    state: FSMContext,
+    lang: str
 ) -> None:
     """
     Вернуться в главное меню администратора.
@@ -111,16 +105,14 @@ async def back_to_admin_menu(
     Args:
         callback: Callback query
         state: FSM контекст
+        lang: Код языка пользователя
     """
     await state.clear()
 
     if callback.from_user.id != ADMIN_ID:
-        lang = await get_user_language(callback.from_user.id)
         await callback.answer(get_text("no_access", lang), show_alert=True)
         return
 
-    lang = await get_user_language(callback.from_user.id)
-
     try:
         await callback.message.edit_text(
             get_text("admin_main_menu", lang),
@@ -135,114 +127,268 @@ async def back_to_admin_menu(
     await callback.answer()
 
 
+@admin_router.message(Command("stats"))
+async def show_stats(message: Message, lang: str) -> None:
+    """
+    Показать статистику кешей бота.
+
+    Args:
+        message: Входящее сообщение
+        lang: Код языка пользователя
+    """
+    if message.from_user.id != ADMIN_ID:
+        await message.answer(get_text("no_access", lang))
+        return
+
+    caches = [
+        ("🌐 Кеш языков", language_cache),
+        ("📚 Кеш каталога", catalog_cache),
+        ("📘 Кеш карточек курсов", card_cache),
+    ]
+    lines = []
+    for label, cache in caches:
+        stats = cache.stats()
+        lines.append(
+            f"{label}: {stats['size']}/{stats['maxsize']}, "
+            f"попаданий {stats['hits']}, промахов {stats['misses']} "
+            f"({stats['hit_rate']:.1%})"
+        )
+    await message.answer("📊 Статистика\n\n" + "\n".join(lines))
+
+
 # ============ Управление пользователями ============
+async def build_users_page(
+    lang: str,
+    after_id: int = 0,
+    before_id: int | None = None
+) -> tuple[str, InlineKeyboardMarkup]:
+    """
+    Построить страницу списка пользователей.
+
+    Страницы листаются по User.id (keyset-пагинация), читаются
+    только поля для списка; фото загружается при выборе пользователя.
+
+    Args:
+        lang: Код языка интерфейса
+        after_id: Показать пользователей с ID больше этого (вперёд)
+        before_id: Показать пользователей с ID меньше этого (назад)
+
+    Returns:
+        Кортеж (текст сообщения, клавиатура)
+    """
+    async with async_session() as session:
+        rows = (
+            await session.execute(
+                keyset_query(
+                    select(User.id, User.user_id, User.name, User.phone),
+                    User.id,
+                    USERS_PAGE_SIZE,
+                    after_id,
+                    before_id
+                )
+            )
+        ).all()
+
+    rows, has_prev, has_next = split_page(
+        rows,
+        USERS_PAGE_SIZE,
+        after_id,
+        before_id
+    )
+    if not rows:
+        return get_text("no_users", lang), admin_back_keyboard(lang)
+
+    # Курсор для возврата к этой странице из карточки пользователя
+    page_cursor = rows[0].id - 1
+    lines = [get_text("users_list_title", lang)]
+    buttons = []
+    for row in rows:
+        user_name = html.quote(row.name or get_text("without_name", lang))
+        phone = row.phone or get_text("not_specified", lang)
+        lines.append(f"• {user_name} — {phone} (ID {row.user_id})")
+        buttons.append([
+            InlineKeyboardButton(
+                text=f"👤 {row.name or get_text('without_name', lang)}",
+                callback_data=f"user_info:{row.id}:{page_cursor}"
+            )
+        ])
+
+    navigation = navigation_row(
+        "users_page",
+        rows[0].id,
+        rows[-1].id,
+        has_prev,
+        has_next,
+        lang
+    )
+    if navigation:
+        buttons.append(navigation)
+    buttons.append([
+        InlineKeyboardButton(
+            text=get_text("btn_admin_back", lang),
+            callback_data="admin_menu"
+        )
+    ])
+
+    return "\n".join(lines), InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
 @admin_router.callback_query(F.data == "show_users")
-async def show_users(callback: CallbackQuery) -> None:
+@admin_router.callback_query(F.data.startswith("users_page:"))
+async def show_users(callback: CallbackQuery, lang: str) -> None:
     """
-    Показать список всех пользователей.
+    Показать страницу списка пользователей.
+
+    Список выводится одним сообщением и листается на месте.
 
     Args:
-        callback: Callback query
+        callback: Callback query (show_users или кнопка листания)
+        lang: Код языка пользователя
     """
     if callback.from_user.id != ADMIN_ID:
-        lang = await get_user_language(callback.from_user.id)
         await callback.answer(get_text("no_access", lang), show_alert=True)
         return
 
-    lang = await get_user_language(callback.from_user.id)
+    after_id, before_id = 0, None
+    if callback.data.startswith("users_page:"):
+        after_id, before_id = parse_page_callback(callback.data)
 
-    async with async_session() as session:
-        result = await session.execute(select(User))
-        users = result.scalars().all()
+    text, keyboard = await build_users_page(lang, after_id, before_id)
 
-    if not users:
-        try:
-            await callback.message.edit_text(
-                get_text("no_users", lang),
-                reply_markup=admin_back_keyboard(lang)
-            )
-        except Exception:
-            await callback.message.answer(
-                get_text("no_users", lang),
-                reply_markup=admin_back_keyboard(lang)
-            )
-        await callback.answer()
+    try:
+        await callback.message.edit_text(
+            text,
+            reply_markup=keyboard,
+            parse_mode="HTML"
+        )
+    except Exception:
+        # Сообщение с фото нельзя превратить в текстовое
+        await callback.message.answer(
+            text,
+            reply_markup=keyboard,
+            parse_mode="HTML"
+        )
+    await callback.answer()
+
+
+@admin_router.callback_query(F.data.startswith("user_info:"))
+async def show_user_info(callback: CallbackQuery, lang: str) -> None:
+    """
+    Показать карточку пользователя с фото.
+
+    Args:
+        callback: Callback query вида user_info:<ID>:<курсор страницы>
+        lang: Код языка пользователя
+    """
+    if callback.from_user.id != ADMIN_ID:
+        await callback.answer(get_text("no_access", lang), show_alert=True)
         return
 
-    for user in users:
-        user_name = user.name or get_text("without_name", lang)
-        phone = user.phone or get_text("not_specified", lang)
-        text = (
-            f"👤 {user_name}\n"
-            f"🆔 Telegram ID: {user.user_id}\n"
-            f"🗄 DB ID: {user.id}\n"
-            f"📱 {phone}"
-        )
+    _, user_id, page_cursor = callback.data.split(":")
 
-        keyboard = InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text=get_text("btn_delete", lang),
-                        callback_data=f"delete_user:{user.id}"
-                    )
-                ]
-            ]
+    async with async_session() as session:
+        user = await session.get(User, int(user_id))
+
+    if not user:
+        await callback.answer(
+            get_text("user_not_found", lang),
+            show_alert=True
         )
+        return
 
-        try:
-            if user.photo:
-                await callback.message.answer_photo(
-                    photo=user.photo,
-                    caption=text,
-                    reply_markup=keyboard
+    user_name = user.name or get_text("without_name", lang)
+    phone = user.phone or get_text("not_specified", lang)
+    text = (
+        f"👤 {user_name}\n"
+        f"🆔 Telegram ID: {user.user_id}\n"
+        f"🗄 DB ID: {user.id}\n"
+        f"📱 {phone}"
+    )
+
+    keyboard = InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=get_text("btn_delete", lang),
+                    callback_data=f"delete_user:{user.id}"
                 )
-            else:
-                await callback.message.answer(text, reply_markup=keyboard)
-        except Exception:
-            error_text = text + "\n\n⚠️ Не удалось отправить фото."
-            await callback.message.answer(
-                error_text,
+            ],
+            [
+                InlineKeyboardButton(
+                    text=get_text("btn_back_to_users", lang),
+                    callback_data=f"users_page:next:{page_cursor}"
+                )
+            ]
+        ]
+    )
+
+    try:
+        if user.photo:
+            await callback.message.answer_photo(
+                photo=user.photo,
+                caption=text,
                 reply_markup=keyboard
             )
-
-    await callback.message.answer(
-        get_text("btn_admin_back", lang),
-        reply_markup=admin_back_keyboard(lang)
-    )
+        else:
+            await callback.message.edit_text(text, reply_markup=keyboard)
+    except Exception:
+        error_text = text + "\n\n⚠️ Не удалось отправить фото."
+        await callback.message.answer(
+            error_text,
+            reply_markup=keyboard
+        )
     await callback.answer()
 
 
 @admin_router.callback_query(F.data.startswith("delete_user:"))
-async def delete_user(callback: CallbackQuery) -> None:
+async def delete_user(callback: CallbackQuery, lang: str) -> None:
     """
     Удалить пользователя.
 
     Args:
         callback: Callback query с ID пользователя
+        lang: Код языка пользователя
     """
     if callback.from_user.id != ADMIN_ID:
-        lang = await get_user_language(callback.from_user.id)
         await callback.answer(get_text("no_access", lang), show_alert=True)
         return
 
-    lang = await get_user_language(callback.from_user.id)
     user_id = int(callback.data.split(":")[1])
 
-    async with async_session() as session:
+    # Отвечаем после выхода из сессии: единственное соединение записи
+    # не держим на время запроса к Telegram
+    async with async_write_session() as session:
         user = await session.get(User, user_id)
-        if not user:
-            await callback.answer(
-                get_text("user_not_found", lang),
-                show_alert=True
-            )
-            return
+        if user:
+            username = user.name or get_text("without_name", lang)
+            telegram_id = user.user_id or get_text("unknown", lang)
+            course_ids = [
+                enrollment.course_id
+                for enrollment in await user.awaitable_attrs.enrollments
+            ]
+
+            await session.delete(user)
+            await session.flush()
 
-        username = user.name or get_text("without_name", lang)
-        telegram_id = user.user_id or get_text("unknown", lang)
+            # Записи удалены каскадом — пересчитываем места и отдаём их
+            # листу ожидания
+            await recount_seats(session, course_ids)
+            promoted = []
+            for course_id in course_ids:
+                promoted += await promote_waitlist(session, course_id)
+            await session.commit()
 
-        await session.delete(user)
-        await session.commit()
+    if not user:
+        await callback.answer(
+            get_text("user_not_found", lang),
+            show_alert=True
+        )
+        return
+
+    await notify_waitlist_promoted(promoted)
+
+    if user.user_id:
+        language_cache.delete(user.user_id)
 
     try:
         message_text = get_text(
@@ -269,66 +415,160 @@ async def delete_user(callback: CallbackQuery) -> None:
 
 
 @admin_router.callback_query(F.data == "delete_all_users")
-async def delete_all_users(callback: CallbackQuery) -> None:
+async def delete_all_users(callback: CallbackQuery, lang: str) -> None:
+    """
+    Показать, что будет удалено, и запросить подтверждение.
+
+    Args:
+        callback: Callback query
+        lang: Код языка пользователя
+    """
+    if callback.from_user.id != ADMIN_ID:
+        await callback.answer(get_text("no_access", lang), show_alert=True)
+        return
+
+    async with async_session() as session:
+        counts = (
+            await session.execute(
+                select(
+                    select(func.count()).select_from(User)
+                    .scalar_subquery().label("users"),
+                    select(func.count()).select_from(Enrollment)
+                    .scalar_subquery().label("enrollments"),
+                    select(func.count()).select_from(Certificate)
+                    .scalar_subquery().label("certificates"),
+                    select(func.count()).select_from(WaitlistEntry)
+                    .scalar_subquery().label("waitlist")
+                )
+            )
+        ).one()
+
+    if not counts.users:
+        await callback.answer(
+            get_text("no_users_to_delete", lang),
+            show_alert=True
+        )
+        return
+
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(
+                text=get_text("btn_confirm_delete_all", lang),
+                callback_data="delete_all_users_confirm"
+            )
+        ],
+        [
+            InlineKeyboardButton(
+                text=get_text("btn_back", lang),
+                callback_data="admin_menu"
+            )
+        ]
+    ])
+    text = get_text("confirm_delete_all_users", lang, **counts._asdict())
+
+    try:
+        await callback.message.edit_text(text, reply_markup=keyboard)
+    except Exception:
+        await callback.message.answer(text, reply_markup=keyboard)
+
+    await callback.answer()
+
+
+@admin_router.callback_query(F.data == "delete_all_users_confirm")
+async def delete_all_users_confirm(callback: CallbackQuery, lang: str) -> None:
     """
     Удалить всех пользователей.
 
+    Пользователи удаляются пачками по DELETE_CHUNK_SIZE одним запросом
+    на пачку, записи на курсы, сертификаты и листы ожидания удаляет
+    ON DELETE CASCADE. Каждая пачка — отдельная транзакция, чтобы
+    не держать блокировку записи всё время удаления.
+
     Args:
         callback: Callback query
+        lang: Код языка пользователя
     """
     if callback.from_user.id != ADMIN_ID:
-        lang = await get_user_language(callback.from_user.id)
         await callback.answer(get_text("no_access", lang), show_alert=True)
         return
 
-    lang = await get_user_language(callback.from_user.id)
+    await callback.answer()
 
     async with async_session() as session:
-        result = await session.execute(select(User))
-        users = result.scalars().all()
+        total = (
+            await session.execute(select(func.count()).select_from(User))
+        ).scalar()
 
-        if not users:
-            await callback.answer(
-                get_text("no_users_to_delete", lang),
-                show_alert=True
+    if not total:
+        await callback.message.answer(
+            get_text("no_users_to_delete", lang),
+            reply_markup=admin_back_keyboard(lang)
+        )
+        return
+
+    done = 0
+    while True:
+        async with async_write_session() as session:
+            result = await session.execute(
+                delete(User).where(
+                    User.id.in_(
+                        select(User.id)
+                        .order_by(User.id)
+                        .limit(DELETE_CHUNK_SIZE)
+                        .scalar_subquery()
+                    )
+                )
             )
-            return
+            await session.commit()
 
-        for user in users:
-            await session.delete(user)
+        if not result.rowcount:
+            break
+
+        done += result.rowcount
+        try:
+            await callback.message.edit_text(
+                get_text(
+                    "delete_all_progress",
+                    lang,
+                    done=done,
+                    total=max(done, total)
+                )
+            )
+        except Exception as e:
+            print(f"Ошибка обновления прогресса удаления: {e}")
+
+    async with async_write_session() as session:
+        await recount_seats(session)
         await session.commit()
 
+    language_cache.clear()
+
     try:
-        await callback.message.answer(
+        await callback.message.edit_text(
             get_text("all_users_deleted", lang),
             reply_markup=admin_back_keyboard(lang)
         )
-        await callback.message.delete()
     except Exception:
-        await callback.answer(
+        await callback.message.answer(
             get_text("all_users_deleted", lang),
-            show_alert=True
+            reply_markup=admin_back_keyboard(lang)
         )
 
-    await callback.answer()
-
 
 # ============ Управление курсами ============
 @admin_router.callback_query(F.data == "manage_courses")
-async def manage_courses(callback: CallbackQuery) -> None:
+async def manage_courses(callback: CallbackQuery, lang: str) -> None:
     """
     Показать список всех курсов для управления.
 
     Args:
         callback: Callback query
+        lang: Код языка пользователя
     """
     if callback.from_user.id != ADMIN_ID:
-        lang = await get_user_language(callback.from_user.id)
         await callback.answer(get_text("no_access", lang), show_alert=True)
         return
 
-    lang = await get_user_language(callback.from_user.id)
-
     async with async_session() as session:
         result = await session.execute(select(Course))
         courses = result.scalars().all()
@@ -359,11 +599,14 @@ async def manage_courses(callback: CallbackQuery) -> None:
             else get_text("not_indicated", lang)
         )
 
+        capacity = course.capacity or get_text("unlimited", lang)
+
         text = (
             f"📘 <b>{course.title}</b>\n\n"
             f"{course.description or get_text('no_description', lang)}\n\n"
             f"{get_text('price', lang, price=course.price)}\n"
-            f"{get_text('dates', lang, start=start_date, end=end_date)}"
+            f"{get_text('dates', lang, start=start_date, end=end_date)}\n"
+            f"{get_text('seats_taken', lang, taken=course.seats_taken, capacity=capacity)}"
         )
 
         keyboard = InlineKeyboardMarkup(
@@ -395,33 +638,34 @@ async def manage_courses(callback: CallbackQuery) -> None:
 
 
 @admin_router.callback_query(F.data.startswith("delete_course:"))
-async def delete_course(callback: CallbackQuery) -> None:
+async def delete_course(callback: CallbackQuery, lang: str) -> None:
     """
     Удалить курс.
 
     Args:
         callback: Callback query с ID курса
+        lang: Код языка пользователя
     """
     if callback.from_user.id != ADMIN_ID:
-        lang = await get_user_language(callback.from_user.id)
         await callback.answer(get_text("no_access", lang), show_alert=True)
         return
 
-    lang = await get_user_language(callback.from_user.id)
     course_id = int(callback.data.split(":")[1])
 
-    async with async_session() as session:
+    async with async_write_session() as session:
         course = await session.get(Course, course_id)
-        if not course:
-            await callback.answer(
-                get_text("course_not_found", lang),
-                show_alert=True
-            )
-            return
+        if course:
+            course_title = course.title
+            await session.delete(course)
+            await session.commit()
 
-        course_title = course.title
-        await session.delete(course)
-        await session.commit()
+    if not course:
+        await callback.answer(
+            get_text("course_not_found", lang),
+            show_alert=True
+        )
+        return
+    invalidate_course_cache()
 
     try:
         await callback.message.answer(
@@ -442,7 +686,8 @@ async def delete_course(callback: CallbackQuery) -> None:
 @admin_router.callback_query(F.data == "add_course")
 async def add_course_start(
     callback: CallbackQuery,
-    state: FSMContext
+    state: FSMContext,
+    lang: str
 ) -> None:
     """
     Начать процесс добавления курса.
@@ -450,14 +695,12 @@ async def add_course_start(
     Args:
         callback: Callback query
         state: FSM контекст
+        lang: Код языка пользователя
     """
     if callback.from_user.id != ADMIN_ID:
-        lang = await get_user_language(callback.from_user.id)
         await callback.answer(get_text("no_access", lang), show_alert=True)
         return
 
-    lang = await get_user_language(callback.from_user.id)
-
     await state.set_state(AddCourseFSM.title)
 
     try:
@@ -473,19 +716,22 @@ async def add_course_start(
 
 
 @admin_router.message(AddCourseFSM.title)
-async def add_course_title(message: Message, state: FSMContext) -> None:
+async def add_course_title(
+    message: Message,
+    state: FSMContext,
+    lang: str
+) -> None:
     """
     Обработать название нового курса.
 
     Args:
         message: Сообщение с названием
         state: FSM контекст
+        lang: Код языка пользователя
     """
     if message.from_user.id != ADMIN_ID:
         return
 
-    lang = await get_user_language(message.from_user.id)
-
     # Проверяем уникальность названия
     async with async_session() as session:
         result = await session.execute(
@@ -505,7 +751,8 @@ async def add_course_title(message: Message, state: FSMContext) -> None:
 @admin_router.message(AddCourseFSM.description)
 async def add_course_description(
     message: Message,
-    state: FSMContext
+    state: FSMContext,
+    lang: str
 ) -> None:
     """
     Обработать описание нового курса.
@@ -513,29 +760,33 @@ async def add_course_description(
     Args:
         message: Сообщение с описанием
         state: FSM контекст
+        lang: Код языка пользователя
     """
     if message.from_user.id != ADMIN_ID:
         return
 
-    lang = await get_user_language(message.from_user.id)
     await state.update_data(description=message.text.strip())
     await state.set_state(AddCourseFSM.price)
     await message.answer(get_text("enter_course_price", lang))
 
 
 @admin_router.message(AddCourseFSM.price, F.text.regexp(r"^\d+$"))
-async def add_course_price(message: Message, state: FSMContext) -> None:
+async def add_course_price(
+    message: Message,
+    state: FSMContext,
+    lang: str
+) -> None:
     """
     Обработать цену нового курса.
 
     Args:
         message: Сообщение с ценой
         state: FSM контекст
+        lang: Код языка пользователя
     """
     if message.from_user.id != ADMIN_ID:
         return
 
-    lang = await get_user_language(message.from_user.id)
     await state.update_data(price=int(message.text.strip()))
     await state.set_state(AddCourseFSM.start_date)
     await message.answer(get_text("enter_start_date", lang))
@@ -544,7 +795,8 @@ async def add_course_price(message: Message, state: FSMContext) -> None:
 @admin_router.message(AddCourseFSM.start_date)
 async def add_course_start_date(
     message: Message,
-    state: FSMContext
+    state: FSMContext,
+    lang: str
 ) -> None:
     """
     Обработать дату начала нового курса.
@@ -552,12 +804,11 @@ async def add_course_start_date(
     Args:
         message: Сообщение с датой
         state: FSM контекст
+        lang: Код языка пользователя
     """
     if message.from_user.id != ADMIN_ID:
         return
 
-    lang = await get_user_language(message.from_user.id)
-
     try:
         start_date = datetime.strptime(
             message.text.strip(),
@@ -575,7 +826,8 @@ async def add_course_start_date(
 @admin_router.message(AddCourseFSM.end_date)
 async def add_course_end_date(
     message: Message,
-    state: FSMContext
+    state: FSMContext,
+    lang: str
 ) -> None:
     """
     Обработать дату окончания и завершить добавление курса.
@@ -583,11 +835,11 @@ async def add_course_end_date(
     Args:
         message: Сообщение с датой
         state: FSM контекст
+        lang: Код языка пользователя
     """
     if message.from_user.id != ADMIN_ID:
         return
 
-    lang = await get_user_language(message.from_user.id)
     data = await state.get_data()
 
     try:
@@ -603,17 +855,43 @@ async def add_course_end_date(
         await message.answer(get_text("end_date_before_start", lang))
         return
 
+    await state.update_data(end_date=end_date)
+    await state.set_state(AddCourseFSM.capacity)
+    await message.answer(get_text("enter_course_capacity", lang))
+
+
+@admin_router.message(AddCourseFSM.capacity, F.text.regexp(r"^\d+$"))
+async def add_course_capacity(
+    message: Message,
+    state: FSMContext,
+    lang: str
+) -> None:
+    """
+    Обработать количество мест и завершить добавление курса.
+
+    Args:
+        message: Сообщение с количеством мест (0 — без ограничений)
+        state: FSM контекст
+        lang: Код языка пользователя
+    """
+    if message.from_user.id != ADMIN_ID:
+        return
+
+    data = await state.get_data()
+
     # Создаем новый курс
-    async with async_session() as session:
+    async with async_write_session() as session:
         new_course = Course(
             title=data["title"],
             description=data["description"],
             price=data["price"],
             start_date=data["start_date"],
-            end_date=end_date
+            end_date=data["end_date"],
+            capacity=int(message.text) or None
         )
         session.add(new_course)
         await session.commit()
+    invalidate_course_cache()
 
     await message.answer(
         get_text("course_added", lang, title=data["title"]),
@@ -626,7 +904,8 @@ async def add_course_end_date(
 @admin_router.callback_query(F.data.startswith("edit_course:"))
 async def edit_course_start(
     callback: CallbackQuery,
-    state: FSMContext
+    state: FSMContext,
+    lang: str
 ) -> None:
     """
     Начать процесс редактирования курса.
@@ -634,13 +913,12 @@ async def edit_course_start(
     Args:
         callback: Callback query с ID курса
         state: FSM контекст
+        lang: Код языка пользователя
     """
     if callback.from_user.id != ADMIN_ID:
-        lang = await get_user_language(callback.from_user.id)
         await callback.answer(get_text("no_access", lang), show_alert=True)
         return
 
-    lang = await get_user_language(callback.from_user.id)
     course_id = int(callback.data.split(":")[1])
 
     async with async_session() as session:
@@ -727,7 +1005,8 @@ async def edit_course_price(message: Message, state: FSMContext) -> None:
 @admin_router.message(EditCourseFSM.start_date)
 async def edit_course_start_date(
     message: Message,
-    state: FSMContext
+    state: FSMContext,
+    lang: str
 ) -> None:
     """
     Обработать новую дату начала курса.
@@ -735,12 +1014,11 @@ async def edit_course_start_date(
     Args:
         message: Сообщение с датой
         state: FSM контекст
+        lang: Код языка пользователя
     """
     if message.from_user.id != ADMIN_ID:
         return
 
-    lang = await get_user_language(message.from_user.id)
-
     try:
         start_date = datetime.strptime(
             message.text.strip(),
@@ -760,7 +1038,8 @@ async def edit_course_start_date(
 @admin_router.message(EditCourseFSM.end_date)
 async def edit_course_end_date(
     message: Message,
-    state: FSMContext
+    state: FSMContext,
+    lang: str
 ) -> None:
     """
     Обработать новую дату окончания и завершить редактирование.
@@ -768,11 +1047,11 @@ async def edit_course_end_date(
     Args:
         message: Сообщение с датой
         state: FSM контекст
+        lang: Код языка пользователя
     """
     if message.from_user.id != ADMIN_ID:
         return
 
-    lang = await get_user_language(message.from_user.id)
     data = await state.get_data()
 
     try:
@@ -788,37 +1067,70 @@ async def edit_course_end_date(
         await message.answer(get_text("end_date_before_start", lang))
         return
 
+    await state.update_data(new_end_date=end_date)
+    await state.set_state(EditCourseFSM.capacity)
+    await message.answer(get_text("enter_course_capacity", lang))
+
+
+@admin_router.message(EditCourseFSM.capacity, F.text.regexp(r"^\d+$"))
+async def edit_course_capacity(
+    message: Message,
+    state: FSMContext,
+    lang: str
+) -> None:
+    """
+    Обработать новое количество мест и завершить редактирование.
+
+    Если мест стало больше, освободившиеся места сразу получают
+    пользователи из листа ожидания.
+
+    Args:
+        message: Сообщение с количеством мест (0 — без ограничений)
+        state: FSM контекст
+        lang: Код языка пользователя
+    """
+    if message.from_user.id != ADMIN_ID:
+        return
+
+    data = await state.get_data()
+
     # Обновляем курс в базе данных
     course_id = data["course_id"]
-    async with async_session() as session:
+    # Ошибку сообщаем после выхода из сессии записи
+    error = None
+    async with async_write_session() as session:
         course = await session.get(Course, course_id)
         if not course:
-            await message.answer(get_text("course_not_found", lang))
-            await state.clear()
-            return
-
-        # Проверяем, не существует ли курса с таким названием
-        result = await session.execute(
-            select(Course).where(
-                Course.title == data["new_title"],
-                Course.id != course_id
+            error = "course_not_found"
+        elif (
+            await session.execute(
+                select(Course.id).where(
+                    Course.title == data["new_title"],
+                    Course.id != course_id
+                )
             )
-        )
-        existing_course = result.scalar_one_or_none()
-
-        if existing_course:
-            await message.answer(get_text("course_title_exists", lang))
-            await state.clear()
-            return
-
-        # Обновляем данные курса
-        course.title = data["new_title"]
-        course.description = data["new_description"]
-        course.price = data["new_price"]
-        course.start_date = data["new_start_date"]
-        course.end_date = end_date
-
-        await session.commit()
+        ).first():
+            # Курс с таким названием уже существует
+            error = "course_title_exists"
+        else:
+            # Обновляем данные курса
+            course.title = data["new_title"]
+            course.description = data["new_description"]
+            course.price = data["new_price"]
+            course.start_date = data["new_start_date"]
+            course.end_date = data["new_end_date"]
+            course.capacity = int(message.text) or None
+            await session.flush()
+
+            promoted = await promote_waitlist(session, course_id)
+            await session.commit()
+
+    if error:
+        await message.answer(get_text(error, lang))
+        await state.clear()
+        return
+    invalidate_course_cache()
+    await notify_waitlist_promoted(promoted)
 
     await message.answer(
         f"✅ Курс «{data['new_title']}» успешно обновлён!",
@@ -828,72 +1140,205 @@ async def edit_course_end_date(
 
 
 # ============ Выдача сертификатов ============
+def user_search_filter(query: str):
+    """
+    Условие поиска пользователя по началу имени или телефона.
+
+    Префикс ищется диапазоном (>= префикс и < префикс + максимальный
+    символ), поэтому запрос использует индексы ix_users_name_lower
+    и users.phone в любой СУБД. Имя сравнивается без учёта регистра,
+    телефон — с «+» в начале и без него, как бы его ни ввели.
+
+    Args:
+        query: Введённый текст
+
+    Returns:
+        Условие для WHERE
+    """
+    def starts_with(column, prefix: str):
+        return and_(column >= prefix, column < prefix + "\U0010ffff")
+
+    conditions = [starts_with(func.lower(User.name), query.lower())]
+
+    digits = query.removeprefix("+")
+    if digits.isdigit():
+        conditions.append(starts_with(User.phone, digits))
+        conditions.append(starts_with(User.phone, "+" + digits))
+    return or_(*conditions)
+
+
+async def build_certificate_user_picker(
+    lang: str,
+    search: str | None = None,
+    after_id: int = 0,
+    before_id: int | None = None
+) -> tuple[str, InlineKeyboardMarkup]:
+    """
+    Построить страницу выбора пользователя для сертификата.
+
+    Args:
+        lang: Код языка интерфейса
+        search: Начало имени или телефона; None — все пользователи
+        after_id: Показать пользователей с ID больше этого (вперёд)
+        before_id: Показать пользователей с ID меньше этого (назад)
+
+    Returns:
+        Кортеж (текст сообщения, клавиатура)
+    """
+    query = select(User.id, User.name, User.phone)
+    if search:
+        query = query.where(user_search_filter(search))
+
+    async with async_session() as session:
+        rows = (
+            await session.execute(
+                keyset_query(
+                    query,
+                    User.id,
+                    CERT_PICKER_PAGE_SIZE,
+                    after_id,
+                    before_id
+                )
+            )
+        ).all()
+
+    rows, has_prev, has_next = split_page(
+        rows,
+        CERT_PICKER_PAGE_SIZE,
+        after_id,
+        before_id
+    )
+
+    buttons = [
+        [
+            InlineKeyboardButton(
+                text=(
+                    f"{row.name or 'ID: ' + str(row.id)} "
+                    f"({row.phone or 'без телефона'})"
+                ),
+                callback_data=f"cert_user:{row.id}"
+            )
+        ]
+        for row in rows
+    ]
+    if rows:
+        navigation = navigation_row(
+            "cert_page",
+            rows[0].id,
+            rows[-1].id,
+            has_prev,
+            has_next,
+            lang
+        )
+        if navigation:
+            buttons.append(navigation)
+    buttons.append([
+        InlineKeyboardButton(
+            text=get_text("btn_back", lang),
+            callback_data="admin_menu"
+        )
+    ])
+
+    if search and not rows:
+        text = f"🔎 По запросу «{html.quote(search)}» никого не найдено. Введите другой запрос:"
+    elif search:
+        text = f"🔎 Результаты по запросу «{html.quote(search)}». Выберите пользователя:"
+    else:
+        text = (
+            "👥 Выберите пользователя для выдачи сертификата "
+            "или введите начало имени либо телефона для поиска:"
+        )
+
+    return text, InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
 @admin_router.callback_query(F.data == "add_certificate")
 async def add_certificate_start(
     callback: CallbackQuery,
-    state: FSMContext
+    state: FSMContext,
+    lang: str
 ) -> None:
     """
     Начать процесс выдачи сертификата.
 
+    Показывает первую страницу пользователей; отправленный текст
+    ищет пользователей по началу имени или телефона.
+
     Args:
         callback: Callback query
         state: FSM контекст
+        lang: Код языка пользователя
     """
     if callback.from_user.id != ADMIN_ID:
-        lang = await get_user_language(callback.from_user.id)
         await callback.answer(get_text("no_access", lang), show_alert=True)
         return
 
-    lang = await get_user_language(callback.from_user.id)
+    text, keyboard = await build_certificate_user_picker(lang)
 
-    # Получаем список всех пользователей
-    async with async_session() as session:
-        result = await session.execute(select(User))
-        users = result.scalars().all()
+    try:
+        await callback.message.edit_text(text, reply_markup=keyboard)
+    except Exception:
+        await callback.message.answer(text, reply_markup=keyboard)
 
-    if not users:
-        await callback.answer(
-            get_text("no_users", lang),
-            show_alert=True
-        )
+    await state.set_state(CertificateFSM.user_selector)
+    await state.update_data(cert_search=None)
+    await callback.answer()
+
+
+@admin_router.message(CertificateFSM.user_selector, F.text)
+async def certificate_user_search(
+    message: Message,
+    state: FSMContext,
+    lang: str
+) -> None:
+    """
+    Найти пользователей по началу имени или телефона.
+
+    Args:
+        message: Сообщение с поисковым запросом
+        state: FSM контекст
+        lang: Код языка пользователя
+    """
+    if message.from_user.id != ADMIN_ID:
         return
 
-    # Создаем клавиатуру с пользователями
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(
-                    text=(
-                        f"{user.name or 'ID: ' + str(user.id)} "
-                        f"({user.phone or 'без телефона'})"
-                    ),
-                    callback_data=f"cert_user:{user.id}"
-                )
-            ]
-            for user in users
-        ] + [
-            [
-                InlineKeyboardButton(
-                    text=get_text("btn_back", lang),
-                    callback_data="admin_menu"
-                )
-            ]
-        ]
-    )
+    search = message.text.strip()
+    await state.update_data(cert_search=search)
 
-    try:
-        await callback.message.edit_text(
-            "👥 Выберите пользователя для выдачи сертификата:",
-            reply_markup=keyboard
-        )
-    except Exception:
-        await callback.message.answer(
-            "👥 Выберите пользователя для выдачи сертификата:",
-            reply_markup=keyboard
-        )
+    text, keyboard = await build_certificate_user_picker(lang, search)
+    await message.answer(text, reply_markup=keyboard)
 
-    await state.set_state(CertificateFSM.user_selector)
+
+@admin_router.callback_query(
+    F.data.startswith("cert_page:"),
+    CertificateFSM.user_selector
+)
+async def certificate_user_page(
+    callback: CallbackQuery,
+    state: FSMContext,
+    lang: str
+) -> None:
+    """
+    Перелистнуть страницу выбора пользователя.
+
+    Args:
+        callback: Callback query кнопки листания
+        state: FSM контекст
+        lang: Код языка пользователя
+    """
+    if callback.from_user.id != ADMIN_ID:
+        return
+
+    data = await state.get_data()
+    after_id, before_id = parse_page_callback(callback.data)
+    text, keyboard = await build_certificate_user_picker(
+        lang,
+        data.get("cert_search"),
+        after_id,
+        before_id
+    )
+
+    await callback.message.edit_text(text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -980,7 +1425,8 @@ async def certificate_title_entered(
 @admin_router.callback_query(F.data == "cert_no_file", CertificateFSM.file)
 async def certificate_no_file(
     callback: CallbackQuery,
-    state: FSMContext
+    state: FSMContext,
+    lang: str
 ) -> None:
     """
     Создать сертификат без файла.
@@ -988,11 +1434,17 @@ async def certificate_no_file(
     Args:
         callback: Callback query
         state: FSM контекст
+        lang: Код языка пользователя
     """
     if callback.from_user.id != ADMIN_ID:
         return
 
-    await create_certificate(callback.message, state, file_id=None)
+    await create_certificate(
+        callback.message,
+        state,
+        file_id=None,
+        lang=lang
+    )
     await callback.answer()
 
 
@@ -1002,7 +1454,8 @@ async def certificate_no_file(
 )
 async def certificate_file_received(
     message: Message,
-    state: FSMContext
+    state: FSMContext,
+    lang: str
 ) -> None:
     """
     Обработать файл сертификата.
@@ -1010,6 +1463,7 @@ async def certificate_file_received(
     Args:
         message: Сообщение с документом
         state: FSM контекст
+        lang: Код языка пользователя
     """
     if message.from_user.id != ADMIN_ID:
         return
@@ -1017,14 +1471,16 @@ async def certificate_file_received(
     await create_certificate(
         message,
         state,
-        file_id=message.document.file_id
+        file_id=message.document.file_id,
+        lang=lang
     )
 
 
 async def create_certificate(
     message: Message,
     state: FSMContext,
-    file_id: str = None
+    file_id: str = None,
+    lang: str = "ru"
 ) -> None:
     """
     Создать сертификат и отправить уведомление пользователю.
@@ -1033,8 +1489,8 @@ async def create_certificate(
         message: Сообщение для ответа
         state: FSM контекст
         file_id: File ID документа сертификата (опционально)
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(message.from_user.id)
     data = await state.get_data()
 
     user_id = data.get("selected_user_id")
@@ -1047,53 +1503,55 @@ async def create_certificate(
         await state.clear()
         return
 
-    async with async_session() as session:
+    async with async_write_session() as session:
         # Проверяем, существует ли пользователь
         user = await session.get(User, user_id)
-        if not user:
-            await message.answer("⚠️ Пользователь не найден.")
-            await state.clear()
-            return
+        if user:
+            # Создаем сертификат
+            session.add(
+                Certificate(
+                    user_id=user_id,
+                    title=title,
+                    file_id=file_id
+                )
+            )
+            await session.commit()
 
-        # Создаем сертификат
-        certificate = Certificate(
-            user_id=user_id,
-            title=title,
-            file_id=file_id
-        )
+    # Отвечаем и уведомляем после выхода из сессии записи
+    if not user:
+        await message.answer("⚠️ Пользователь не найден.")
+        await state.clear()
+        return
 
-        session.add(certificate)
-        await session.commit()
+    # Уведомляем пользователя
+    if user.user_id:
+        try:
+            notification_text = (
+                f"🏅 Поздравляем! Вам выдан сертификат:\n\n"
+                f"<b>{title}</b>"
+            )
 
-        # Уведомляем пользователя
-        if user.user_id:
-            try:
-                notification_text = (
-                    f"🏅 Поздравляем! Вам выдан сертификат:\n\n"
-                    f"<b>{title}</b>"
-                )
+            await message.bot.send_message(
+                user.user_id,
+                notification_text,
+                parse_mode="HTML"
+            )
 
-                await message.bot.send_message(
-                    user.user_id,
-                    notification_text,
-                    parse_mode="HTML"
-                )
+            # Если есть файл, отправляем его
+            if file_id:
+                try:
+                    await message.bot.send_document(
+                        user.user_id,
+                        file_id,
+                        caption="📄 Ваш сертификат"
+                    )
+                except Exception as e:
+                    print(
+                        f"Ошибка при отправке файла сертификата: {e}"
+                    )
 
-                # Если есть файл, отправляем его
-                if file_id:
-                    try:
-                        await message.bot.send_document(
-                            user.user_id,
-                            file_id,
-                            caption="📄 Ваш сертификат"
-                        )
-                    except Exception as e:
-                        print(
-                            f"Ошибка при отправке файла сертификата: {e}"
-                        )
-
-            except Exception as e:
-                print(f"Ошибка при уведомлении пользователя: {e}")
+        except Exception as e:
+            print(f"Ошибка при уведомлении пользователя: {e}")
 
     # Подтверждение админу
     confirmation_text = (
@@ -1141,6 +1599,27 @@ async def invalid_edit_price(message: Message, state: FSMContext) -> None:
     await message.answer("⚠️ Введите корректную цену (только цифры):")
 
 
+@admin_router.message(AddCourseFSM.capacity)
+@admin_router.message(EditCourseFSM.capacity)
+async def invalid_capacity(
+    message: Message,
+    state: FSMContext,
+    lang: str
+) -> None:
+    """
+    Обработать неправильный формат количества мест.
+
+    Args:
+        message: Входящее сообщение
+        state: FSM контекст
+        lang: Код языка пользователя
+    """
+    if message.from_user.id != ADMIN_ID:
+        return
+
+    await message.answer(get_text("invalid_capacity_format", lang))
+
+
 @admin_router.message(CertificateFSM.file)
 async def invalid_certificate_file(
     message: Message,
@@ -4,54 +4,35 @@
 from aiogram import Router, F, types
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
-from sqlalchemy import select
+from sqlalchemy import or_, select, update
 
 from db.models import User
-from db.session import async_session
+from db.session import async_session, async_write_session
 from fsm.auth import Auth
 from i18n.locales import get_text
+from i18n.menu import MenuButton
+from middlewares.user_context import language_cache, user_language
 
 auth_router = Router()
 
 
-async def get_user_language(user_id: int) -> str:
-    """
-    Получить язык пользователя из БД.
-    
-    Args:
-        user_id: Telegram ID пользователя
-        
-    Returns:
-        Код языка (ru/en/uz), по умолчанию 'ru'
-    """
-    async with async_session() as session:
-        result = await session.execute(
-            select(User).where(User.user_id == user_id)
-        )
-        user = result.scalar_one_or_none()
-        return user.language if user and user.language else "ru"
-
-
 @auth_router.message(Command("login"))
-@auth_router.message(
-    F.text.in_(["Авторизация", "Authorization", "Kirish"])
-)
-async def start_auth(message: types.Message, state: FSMContext) -> None:
+@auth_router.message(MenuButton("btn_auth"))
+async def start_auth(
+    message: types.Message,
+    state: FSMContext,
+    user: User | None,
+    lang: str
+) -> None:
     """
     Начать процесс авторизации.
     
     Args:
         message: Входящее сообщение
         state: FSM контекст
+        user: Пользователь из БД или None
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(message.from_user.id)
-    
-    async with async_session() as session:
-        result = await session.execute(
-            select(User).where(User.user_id == message.from_user.id)
-        )
-        user = result.scalar_one_or_none()
-
     if user and user.is_active:
         await message.answer(get_text("already_logged_in", lang))
     else:
@@ -62,7 +43,8 @@ async def start_auth(message: types.Message, state: FSMContext) -> None:
 @auth_router.message(Auth.phone, F.text.regexp(r"^\+?\d{10,15}$"))
 async def process_phone_auth(
     message: types.Message,
-    state: FSMContext
+    state: FSMContext,
+    lang: str
 ) -> None:
     """
     Обработать введённый номер телефона для авторизации.
@@ -70,53 +52,64 @@ async def process_phone_auth(
     Args:
         message: Сообщение с номером телефона
         state: FSM контекст
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(message.from_user.id)
-    
+    # Поиск — через пул чтения; единственное соединение записи
+    # занимаем только для обновления и отпускаем до ответа
     async with async_session() as session:
         result = await session.execute(
             select(User).where(User.phone == message.text)
         )
         user = result.scalar_one_or_none()
 
-        if user:
-            if user.user_id and user.is_active:
-                await message.answer(
-                    get_text("account_already_active", lang)
+    if user is None:
+        key = "user_not_found"
+    elif user.user_id and user.is_active:
+        key = "account_already_active"
+    else:
+        async with async_write_session() as session:
+            # Условие повторяет проверку: аккаунт могли занять,
+            # пока мы читали
+            result = await session.execute(
+                update(User)
+                .where(
+                    User.id == user.id,
+                    or_(User.user_id.is_(None), User.is_active.is_(False))
                 )
-            else:
-                user.user_id = message.from_user.id
-                user.is_active = True
-                session.add(user)
-                await session.commit()
-                await message.answer(get_text("login_success", lang))
+                .values(user_id=message.from_user.id, is_active=True)
+            )
+            await session.commit()
+
+        if result.rowcount:
+            key = "login_success"
+            language_cache.set(message.from_user.id, user_language(user))
         else:
-            await message.answer(get_text("user_not_found", lang))
+            key = "account_already_active"
 
+    await message.answer(get_text(key, lang))
     await state.clear()
 
 
 @auth_router.message(Command("logout"))
-@auth_router.message(F.text.in_(["Выход", "Logout", "Chiqish"]))
-async def logout(message: types.Message) -> None:
+@auth_router.message(MenuButton("btn_logout"))
+async def logout(
+    message: types.Message,
+    user: User | None,
+    lang: str
+) -> None:
     """
     Выйти из системы (деактивировать пользователя).
     
     Args:
         message: Входящее сообщение
+        user: Пользователь из БД или None
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(message.from_user.id)
-    
-    async with async_session() as session:
-        result = await session.execute(
-            select(User).where(User.user_id == message.from_user.id)
-        )
-        user = result.scalar_one_or_none()
-
-        if user and user.is_active:
-            user.is_active = False
+    if user and user.is_active:
+        async with async_write_session() as session:
             session.add(user)
+            user.is_active = False
             await session.commit()
-            await message.answer(get_text("logout_success", lang))
-        else:
-            await message.answer(get_text("not_authorized", lang))
+        await message.answer(get_text("logout_success", lang))
+    else:
+        await message.answer(get_text("not_authorized", lang))
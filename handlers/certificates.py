@@ -1,67 +1,112 @@
 from aiogram import Router, F, types
+from aiogram.types import InlineKeyboardMarkup, InputMediaDocument
 from sqlalchemy import select
 from db.models import Certificate, User
 from db.session import async_session
 from config.bot_config import ADMIN_ID
 from keyboards.reply import main_menu
 from i18n.locales import get_text
+from i18n.menu import MenuButton
+from utils.pagination import keyset_query, navigation_row, parse_page_callback, split_page
 
 certificates_router = Router()
 
-async def get_user_language(user_id: int) -> str:
-    """Получить язык пользователя из БД"""
+# Сертификатов на странице; столько же документов умещается в одну медиагруппу
+CERTIFICATES_PAGE_SIZE = 10
+
+
+async def build_certificates_page(lang: str, after_id: int = 0, before_id: int | None = None):
+    """
+    Построить страницу списка всех сертификатов.
+
+    Сертификаты загружаются вместе с именами владельцев одним запросом.
+
+    Returns:
+        Кортеж (текст, клавиатура листания или None, документы страницы);
+        текст None, если сертификатов нет
+    """
+    query = keyset_query(
+        select(Certificate.id, Certificate.title, Certificate.file_id, Certificate.user_id, User.name)
+        .outerjoin(User, Certificate.user_id == User.id),
+        Certificate.id,
+        CERTIFICATES_PAGE_SIZE,
+        after_id,
+        before_id
+    )
+
     async with async_session() as session:
-        result = await session.execute(
-            select(User).where(User.user_id == user_id)
-        )
-        user = result.scalar_one_or_none()
-        return user.language if user and user.language else "ru"
+        rows = (await session.execute(query)).all()
+
+    rows, has_prev, has_next = split_page(rows, CERTIFICATES_PAGE_SIZE, after_id, before_id)
+    if not rows:
+        return None, None, []
+
+    lines = []
+    documents = []
+    for row in rows:
+        user_line = get_text("user", lang, name=row.name or str(row.user_id))
+        lines.append(f"🏅 {row.title}\n{user_line}")
+        if row.file_id:
+            documents.append(InputMediaDocument(media=row.file_id, caption=f"🏅 {row.title}\n{user_line}"))
+
+    navigation = navigation_row("certificates", rows[0].id, rows[-1].id, has_prev, has_next, lang)
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[navigation]) if navigation else None
+
+    return "\n\n".join(lines), keyboard, documents
+
+
+async def send_certificate_documents(message: types.Message, documents: list[InputMediaDocument], lang: str):
+    """Отправить документы страницы одной медиагруппой (один документ — отдельно)."""
+    if not documents:
+        return
+
+    try:
+        if len(documents) == 1:
+            await message.answer_document(documents[0].media, caption=documents[0].caption)
+        else:
+            await message.answer_media_group(documents)
+    except Exception:
+        await message.answer(get_text("certificate_file_error", lang))
 
-@certificates_router.message(F.text.in_(["Сертификаты", "Certificates", "Sertifikatlar"]))
-async def show_all_certificates(message: types.Message):
-    lang = await get_user_language(message.from_user.id)
-    
+
+@certificates_router.message(MenuButton("btn_admin_certificates"))
+async def show_all_certificates(message: types.Message, lang: str):
     if message.from_user.id != ADMIN_ID:
         await message.answer(get_text("no_access", lang))
         return
 
-    async with async_session() as session:
-        result = await session.execute(select(Certificate))
-        certificates = result.scalars().all()
+    text, keyboard, documents = await build_certificates_page(lang)
+    if text is None:
+        await message.answer(get_text("no_certificates", lang), reply_markup=main_menu(message.from_user.id, lang))
+        return
+
+    await message.answer(text, reply_markup=keyboard)
+    await send_certificate_documents(message, documents, lang)
 
-        if not certificates:
-            await message.answer(get_text("no_certificates", lang), reply_markup=main_menu(message.from_user.id, lang))
-            return
-
-        for cert in certificates:
-            user = await session.get(User, cert.user_id)
-            user_name = user.name if user else str(cert.user_id)
-            text = f"🏅 {cert.title}\n{get_text('user', lang, name=user_name)}"
-            await message.answer(text)
-
-            if cert.file_id:
-                try:
-                    await message.answer_document(cert.file_id, caption=get_text("certificate_file", lang))
-                except Exception:
-                    await message.answer(get_text("certificate_file_error", lang))
-
-@certificates_router.message(F.text.in_(["Мои сертификаты", "My Certificates", "Mening sertifikatlarim"]))
-async def show_my_certificates(message: types.Message):
-    lang = await get_user_language(message.from_user.id)
-    
-    async with async_session() as session:
-        result_user = await session.execute(
-            select(User).where(User.user_id == message.from_user.id)
-        )
-        user = result_user.scalar_one_or_none()
 
-        if not user:
-            await message.answer(
-                get_text("not_registered", lang),
-                reply_markup=main_menu(message.from_user.id, lang)
-            )
-            return
+@certificates_router.callback_query(F.data.startswith("certificates:"))
+async def paginate_certificates(callback: types.CallbackQuery, lang: str):
+    if callback.from_user.id != ADMIN_ID:
+        await callback.answer(get_text("no_access", lang), show_alert=True)
+        return
+
+    after_id, before_id = parse_page_callback(callback.data)
+    text, keyboard, documents = await build_certificates_page(lang, after_id, before_id)
 
+    await callback.message.edit_text(text or get_text("no_certificates", lang), reply_markup=keyboard)
+    await send_certificate_documents(callback.message, documents, lang)
+    await callback.answer()
+
+@certificates_router.message(MenuButton("btn_certificates"))
+async def show_my_certificates(message: types.Message, user: User | None, lang: str):
+    if not user:
+        await message.answer(
+            get_text("not_registered", lang),
+            reply_markup=main_menu(message.from_user.id, lang)
+        )
+        return
+
+    async with async_session() as session:
         result = await session.execute(
             select(Certificate).where(Certificate.user_id == user.id)
         )
@@ -2,8 +2,6 @@
 """
 Обработчики для просмотра курсов и записи на них.
 """
-from datetime import date
-
 from aiogram import Router, F
 from aiogram.filters import Command
 from aiogram.types import (
@@ -12,32 +10,52 @@ from aiogram.types import (
     CallbackQuery,
     Message
 )
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Row, and_, delete, select
 
+from config.bot_config import COURSE_CACHE_TTL, COURSE_CARD_CACHE_SIZE
 from db.models import User, Course, Enrollment
-from db.session import async_session
-from i18n.locales import get_text
+from db.enrollment import (
+    insert_enrollment,
+    join_waitlist,
+    promote_waitlist,
+    release_seat,
+    reserve_seat
+)
+from db.session import async_session, async_write_session
+from i18n.locales import get_text, on_reload
+from i18n.menu import MenuButton
+from notifier import notify_waitlist_promoted
+from utils.cache import LRUCache
 
 courses_router = Router()
 
+# Готовый каталог курсов: язык → (текст, клавиатура)
+catalog_cache = LRUCache(maxsize=16, ttl=COURSE_CACHE_TTL)
 
-async def get_user_language(user_id: int) -> str:
-    """
-    Получить язык пользователя из БД.
+# Тексты карточек курсов: (ID курса, язык) → текст без статуса записи
+card_cache = LRUCache(maxsize=COURSE_CARD_CACHE_SIZE, ttl=COURSE_CACHE_TTL)
 
-    Args:
-        user_id: Telegram ID пользователя
+# Запись и отписка пишут в БД: общий, более строгий лимит частоты
+ENROLL_THROTTLE = {"key": "enroll", "rate": 0.5, "burst": 2}
 
-    Returns:
-        Код языка (ru/en/uz), по умолчанию 'ru'
+# Номер версии курсов; увеличивается при каждом сбросе кешей
+_catalog_version = 0
+
+
+def invalidate_course_cache() -> None:
     """
-    async with async_session() as session:
-        result = await session.execute(
-            select(User).where(User.user_id == user_id)
-        )
-        user = result.scalar_one_or_none()
-        return user.language if user and user.language else "ru"
+    Сбросить кеши каталога и карточек курсов.
+
+    Вызывается после добавления, изменения или удаления курса
+    и после перечитывания переводов.
+    """
+    global _catalog_version
+    _catalog_version += 1
+    catalog_cache.clear()
+    card_cache.clear()
+
+
+on_reload(invalidate_course_cache)
 
 
 async def build_courses_message(
@@ -46,44 +64,57 @@ async def build_courses_message(
     """
     Построить сообщение со списком курсов.
 
+    Готовое сообщение кешируется для каждого языка до изменения курсов.
+
     Args:
         lang: Код языка интерфейса
 
     Returns:
         Кортеж (текст сообщения, клавиатура)
     """
+    cached = catalog_cache.get(lang)
+    if cached is not None:
+        return cached
+
+    version = _catalog_version
     async with async_session() as session:
-        result = await session.execute(select(Course))
-        courses = result.scalars().all()
+        result = await session.execute(
+            select(Course.id, Course.title).order_by(Course.id)
+        )
+        courses = result.all()
 
     if not courses:
-        return get_text("no_courses", lang), None
-
-    text = get_text("available_courses", lang)
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(
-                    text=course.title,
-                    callback_data=f"course:{course.id}"
-                )
+        message = get_text("no_courses", lang), None
+    else:
+        keyboard = InlineKeyboardMarkup(
+            inline_keyboard=[
+                [
+                    InlineKeyboardButton(
+                        text=title,
+                        callback_data=f"course:{course_id}"
+                    )
+                ]
+                for course_id, title in courses
             ]
-            for course in courses
-        ]
-    )
-    return text, keyboard
+        )
+        message = get_text("available_courses", lang), keyboard
+
+    # Курсы изменились, пока шёл запрос, — результат уже устарел
+    if version == _catalog_version:
+        catalog_cache.set(lang, message)
+    return message
 
 
 @courses_router.message(Command("courses"))
-@courses_router.message(F.text.in_(["Курсы", "Courses", "Kurslar"]))
-async def show_courses(message: Message) -> None:
+@courses_router.message(MenuButton("btn_courses"))
+async def show_courses(message: Message, lang: str) -> None:
     """
     Показать список доступных курсов.
 
     Args:
         message: Входящее сообщение
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(message.from_user.id)
     text, keyboard = await build_courses_message(lang)
 
     if not keyboard:
@@ -92,45 +123,17 @@ async def show_courses(message: Message) -> None:
         await message.answer(text, reply_markup=keyboard)
 
 
-@courses_router.callback_query(F.data.startswith("course:"))
-async def show_course_info(callback: CallbackQuery) -> None:
+def render_course_card(course: Course | Row, lang: str) -> str:
     """
-    Показать информацию о конкретном курсе.
+    Сформировать текст карточки курса без статуса записи.
 
     Args:
-        callback: Callback query с ID курса
-    """
-    lang = await get_user_language(callback.from_user.id)
-    course_id = int(callback.data.split(":")[1])
-
-    async with async_session() as session:
-        course = await session.get(Course, course_id)
-        if not course:
-            await callback.answer(
-                get_text("course_not_found", lang),
-                show_alert=True
-            )
-            return
-
-        # Проверка пользователя
-        result_user = await session.execute(
-            select(User).where(User.user_id == callback.from_user.id)
-        )
-        user = result_user.scalar_one_or_none()
-
-        enrollment = None
-        if user:
-            result = await session.execute(
-                select(Enrollment)
-                .options(selectinload(Enrollment.course))
-                .where(
-                    Enrollment.user_id == user.id,
-                    Enrollment.course_id == course_id
-                )
-            )
-            enrollment = result.scalar_one_or_none()
+        course: Курс (модель или строка с теми же полями)
+        lang: Код языка интерфейса
 
-    # Формируем текст курса
+    Returns:
+        Текст карточки в HTML
+    """
     start_date_str = (
         course.start_date.strftime("%d.%m.%Y")
         if course.start_date
@@ -148,15 +151,90 @@ async def show_course_info(callback: CallbackQuery) -> None:
         f"{get_text('price', lang, price=course.price)}\n"
         f"{get_text('dates', lang, start=start_date_str, end=end_date_str)}"
     )
+    if course.capacity:
+        text += f"\n{get_text('seats', lang, capacity=course.capacity)}"
+    return text
+
+
+@courses_router.callback_query(F.data.startswith("course:"))
+async def show_course_info(callback: CallbackQuery, lang: str) -> None:
+    """
+    Показать информацию о конкретном курсе.
+
+    Курс и запись текущего пользователя читаются одним запросом
+    (курс LEFT JOIN пользователь LEFT JOIN запись); текст карточки
+    кешируется, и при попадании в кеш читается только запись.
+
+    Args:
+        callback: Callback query с ID курса
+        lang: Код языка пользователя
+    """
+    course_id = int(callback.data.split(":")[1])
+    card = card_cache.get((course_id, lang))
+    enrollment_columns = (
+        Enrollment.id.label("enrollment_id"),
+        Enrollment.is_completed,
+        Enrollment.end_date.label("enrollment_end_date")
+    )
+
+    if card is None:
+        version = _catalog_version
+        query = (
+            select(
+                Course.title,
+                Course.description,
+                Course.price,
+                Course.start_date,
+                Course.end_date,
+                Course.capacity,
+                *enrollment_columns
+            )
+            .select_from(Course)
+            .outerjoin(User, User.user_id == callback.from_user.id)
+            .outerjoin(
+                Enrollment,
+                and_(
+                    Enrollment.course_id == Course.id,
+                    Enrollment.user_id == User.id
+                )
+            )
+            .where(Course.id == course_id)
+        )
+    else:
+        query = (
+            select(*enrollment_columns)
+            .join(User, Enrollment.user_id == User.id)
+            .where(
+                User.user_id == callback.from_user.id,
+                Enrollment.course_id == course_id
+            )
+        )
+
+    async with async_session() as session:
+        row = (await session.execute(query)).one_or_none()
+
+    if card is None:
+        if not row:
+            await callback.answer(
+                get_text("course_not_found", lang),
+                show_alert=True
+            )
+            return
+
+        card = render_course_card(row, lang)
+        if version == _catalog_version:
+            card_cache.set((course_id, lang), card)
+
+    text = card
 
     # Кнопки
-    if enrollment:
-        if enrollment.is_completed:
+    if row and row.enrollment_id:
+        if row.is_completed:
             status = get_text("status_completed", lang)
         else:
             end_date_display = (
-                enrollment.end_date.strftime("%d.%m.%Y")
-                if enrollment.end_date
+                row.enrollment_end_date.strftime("%d.%m.%Y")
+                if row.enrollment_end_date
                 else get_text("not_indicated", lang)
             )
             status = get_text("status_until", lang, date=end_date_display)
@@ -164,12 +242,12 @@ async def show_course_info(callback: CallbackQuery) -> None:
         text += f"\n\n{get_text('status', lang, status=status)}"
         action_button = InlineKeyboardButton(
             text=get_text("btn_unenroll", lang),
-            callback_data=f"unenroll:{course.id}"
+            callback_data=f"unenroll:{course_id}"
         )
     else:
         action_button = InlineKeyboardButton(
             text=get_text("btn_enroll", lang),
-            callback_data=f"enroll:{course.id}"
+            callback_data=f"enroll:{course_id}"
         )
 
     keyboard = InlineKeyboardMarkup(
@@ -190,124 +268,185 @@ async def show_course_info(callback: CallbackQuery) -> None:
     )
 
 
-@courses_router.callback_query(F.data.startswith("enroll:"))
-async def enroll_course(callback: CallbackQuery) -> None:
+@courses_router.callback_query(
+    F.data.startswith("enroll:"),
+    flags={"throttle": ENROLL_THROTTLE}
+)
+async def enroll_course(callback: CallbackQuery, lang: str) -> None:
     """
     Записать пользователя на курс.
 
+    Запись создаётся одним INSERT ... ON CONFLICT DO NOTHING RETURNING
+    (уникальный индекс (user_id, course_id) защищает от двойного
+    нажатия), затем атомарно занимается место. Если мест нет,
+    транзакция откатывается и пользователь встаёт в лист ожидания.
+    Причину отказа уточняет дополнительный запрос только в этом случае.
+
     Args:
         callback: Callback query с ID курса
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(callback.from_user.id)
     course_id = int(callback.data.split(":")[1])
+    telegram_id = callback.from_user.id
+
+    # Отвечаем после выхода из сессии записи
+    waitlisted = None
+    async with async_write_session() as session:
+        title = (
+            await session.execute(
+                insert_enrollment(course_id, User.user_id == telegram_id)
+            )
+        ).scalar_one_or_none()
 
-    async with async_session() as session:
-        # Проверка пользователя
-        result = await session.execute(
-            select(User).where(User.user_id == callback.from_user.id)
+        if title is not None and not await reserve_seat(session, course_id):
+            await session.rollback()
+            waitlisted = await join_waitlist(session, course_id, telegram_id)
+
+        await session.commit()
+
+    if waitlisted is not None:
+        await callback.answer(
+            get_text(
+                "course_full_waitlisted"
+                if waitlisted
+                else "already_waitlisted",
+                lang
+            ),
+            show_alert=True
         )
-        user = result.scalar_one_or_none()
+        return
 
-        if not user:
-            await callback.answer(
-                get_text("register_first", lang),
-                show_alert=True
-            )
-            return
+    if title is not None:
+        await callback.message.edit_text(
+            get_text("enrolled_success", lang, title=title)
+        )
+        return
 
-        # Проверка курса
-        course = await session.get(Course, course_id)
-        if not course:
-            await callback.answer(
-                get_text("course_not_found", lang),
-                show_alert=True
+    async with async_session() as session:
+        user_exists, course_exists = (
+            await session.execute(
+                select(
+                    select(User.id).where(User.user_id == telegram_id).exists(),
+                    select(Course.id).where(Course.id == course_id).exists()
+                )
             )
-            return
+        ).one()
 
-        # Проверка записи
-        existing = await session.execute(
-            select(Enrollment).where(
-                Enrollment.user_id == user.id,
-                Enrollment.course_id == course_id
-            )
-        )
-        if existing.scalar_one_or_none():
-            await callback.answer(
-                get_text("already_enrolled", lang),
-                show_alert=True
+    if not user_exists:
+        key = "register_first"
+    elif not course_exists:
+        key = "course_not_found"
+    else:
+        key = "already_enrolled"
+    await callback.answer(get_text(key, lang), show_alert=True)
+
+
+async def remove_enrollment(
+    telegram_id: int,
+    course_id: int
+) -> list[tuple[int, str, str]] | None:
+    """
+    Удалить запись пользователя на курс.
+
+    Запись удаляется одним DELETE ... RETURNING, освободившееся место
+    в той же транзакции получает первый из листа ожидания.
+
+    Args:
+        telegram_id: Telegram ID пользователя
+        course_id: ID курса
+
+    Returns:
+        Переведённые из листа ожидания (для notify_waitlist_promoted)
+        или None, если записи не было
+    """
+    user_id = (
+        select(User.id)
+        .where(User.user_id == telegram_id)
+        .scalar_subquery()
+    )
+
+    async with async_write_session() as session:
+        deleted = (
+            await session.execute(
+                delete(Enrollment)
+                .where(
+                    Enrollment.user_id == user_id,
+                    Enrollment.course_id == course_id
+                )
+                .returning(Enrollment.id)
             )
-            return
+        ).scalar_one_or_none()
 
-        # Создаём запись с датами из курса
-        enrollment = Enrollment(
-            user_id=user.id,
-            course_id=course.id,
-            start_date=course.start_date or date.today(),
-            end_date=course.end_date,
-            is_completed=False
-        )
-        session.add(enrollment)
+        if deleted is None:
+            return None
+
+        await release_seat(session, course_id)
+        promoted = await promote_waitlist(session, course_id)
         await session.commit()
 
-    await callback.message.edit_text(
-        get_text("enrolled_success", lang, title=course.title)
-    )
+    return promoted
 
 
-@courses_router.callback_query(F.data.startswith("unenroll:"))
-async def unenroll_course(callback: CallbackQuery) -> None:
+async def answer_not_enrolled(callback: CallbackQuery, lang: str) -> None:
     """
-    Отписать пользователя от курса.
+    Ответить, что отписываться не от чего.
+
+    Дополнительный запрос уточняет, зарегистрирован ли пользователь.
 
     Args:
-        callback: Callback query с ID курса
+        callback: Callback query
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(callback.from_user.id)
-    course_id = int(callback.data.split(":")[1])
-
     async with async_session() as session:
-        result = await session.execute(
-            select(User).where(User.user_id == callback.from_user.id)
-        )
-        user = result.scalar_one_or_none()
-
-        if not user:
-            await callback.answer(
-                get_text("register_first", lang),
-                show_alert=True
+        user_exists = (
+            await session.execute(
+                select(
+                    select(User.id)
+                    .where(User.user_id == callback.from_user.id)
+                    .exists()
+                )
             )
-            return
+        ).scalar()
 
-        enrollment_q = await session.execute(
-            select(Enrollment).where(
-                Enrollment.user_id == user.id,
-                Enrollment.course_id == course_id
-            )
-        )
-        enrollment = enrollment_q.scalar_one_or_none()
+    await callback.answer(
+        get_text("not_enrolled" if user_exists else "register_first", lang),
+        show_alert=True
+    )
 
-        if not enrollment:
-            await callback.answer(
-                get_text("not_enrolled", lang),
-                show_alert=True
-            )
-            return
 
-        await session.delete(enrollment)
-        await session.commit()
+@courses_router.callback_query(
+    F.data.startswith("unenroll:"),
+    flags={"throttle": ENROLL_THROTTLE}
+)
+async def unenroll_course(callback: CallbackQuery, lang: str) -> None:
+    """
+    Отписать пользователя от курса.
+
+    Args:
+        callback: Callback query с ID курса
+        lang: Код языка пользователя
+    """
+    course_id = int(callback.data.split(":")[1])
+    telegram_id = callback.from_user.id
+    promoted = await remove_enrollment(telegram_id, course_id)
+
+    if promoted is not None:
+        await callback.message.edit_text(get_text("unenrolled_success", lang))
+        await notify_waitlist_promoted(promoted)
+        return
 
-    await callback.message.edit_text(get_text("unenrolled_success", lang))
+    await answer_not_enrolled(callback, lang)
 
 
 @courses_router.callback_query(F.data == "back_to_courses")
-async def back_to_courses(callback: CallbackQuery) -> None:
+async def back_to_courses(callback: CallbackQuery, lang: str) -> None:
     """
     Вернуться к списку курсов.
 
     Args:
         callback: Callback query
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(callback.from_user.id)
     text, keyboard = await build_courses_message(lang)
 
     if not keyboard:
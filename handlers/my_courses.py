@@ -6,96 +6,220 @@ from aiogram import Router, F, types
 from aiogram.filters import Command
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 
-from db.models import User, Enrollment
+from db.models import User, Course, Enrollment
 from db.session import async_session
 from i18n.locales import get_text
+from i18n.menu import MenuButton
+from handlers.courses import (
+    ENROLL_THROTTLE,
+    answer_not_enrolled,
+    remove_enrollment
+)
+from notifier import notify_waitlist_promoted
+from utils.pagination import (
+    keyset_query,
+    navigation_row,
+    parse_page_callback,
+    split_page
+)
 
 my_courses_router = Router()
 
+# Сколько курсов показывать на одной странице
+MY_COURSES_PAGE_SIZE = 5
+
 
-async def get_user_language(user_id: int) -> str:
+async def build_my_courses_page(
+    telegram_id: int,
+    lang: str,
+    after_id: int = 0,
+    before_id: int | None = None
+) -> tuple[str, InlineKeyboardMarkup | None]:
     """
-    Получить язык пользователя из БД.
+    Построить страницу списка курсов пользователя.
+
+    Страницы листаются по ID записи (keyset-пагинация).
 
     Args:
-        user_id: Telegram ID пользователя
+        telegram_id: Telegram ID пользователя
+        lang: Код языка интерфейса
+        after_id: Показать записи с ID больше этого (вперёд)
+        before_id: Показать записи с ID меньше этого (назад)
 
     Returns:
-        Код языка (ru/en/uz), по умолчанию 'ru'
+        Кортеж (текст сообщения, клавиатура); клавиатуры нет,
+        если у пользователя нет курсов
     """
+    query = keyset_query(
+        select(
+            Enrollment.id,
+            Enrollment.is_completed,
+            Enrollment.end_date,
+            Course.id.label("course_id"),
+            Course.title,
+            Course.price
+        )
+        .join(Course, Enrollment.course_id == Course.id)
+        .join(User, Enrollment.user_id == User.id)
+        .where(User.user_id == telegram_id),
+        Enrollment.id,
+        MY_COURSES_PAGE_SIZE,
+        after_id,
+        before_id
+    )
+
     async with async_session() as session:
-        result = await session.execute(
-            select(User).where(User.user_id == user_id)
+        rows = (await session.execute(query)).all()
+
+    rows, has_prev, has_next = split_page(
+        rows,
+        MY_COURSES_PAGE_SIZE,
+        after_id,
+        before_id
+    )
+
+    if not rows:
+        if before_id is None and after_id == 0:
+            async with async_session() as session:
+                registered = (
+                    await session.execute(
+                        select(
+                            select(User.id)
+                            .where(User.user_id == telegram_id)
+                            .exists()
+                        )
+                    )
+                ).scalar()
+            key = "no_my_courses" if registered else "not_registered"
+        else:
+            key = "no_my_courses"
+        return get_text(key, lang), None
+
+    blocks = [get_text("my_courses_title", lang)]
+    buttons = []
+    # Отписка возвращает на эту же страницу
+    page_cursor = rows[0].id - 1
+    for row in rows:
+        if row.is_completed:
+            status = get_text("status_completed", lang)
+        else:
+            end_date_str = (
+                row.end_date.strftime("%d.%m.%Y")
+                if row.end_date
+                else get_text("not_indicated", lang)
+            )
+            status = get_text("status_until", lang, date=end_date_str)
+
+        blocks.append(
+            f"📘 <b>{row.title}</b>\n"
+            f"{get_text('price', lang, price=row.price)}\n"
+            f"{get_text('status', lang, status=status)}"
         )
-        user = result.scalar_one_or_none()
-        return user.language if user and user.language else "ru"
+        buttons.append([
+            InlineKeyboardButton(
+                text=f"{get_text('btn_unenroll', lang)}: {row.title}",
+                callback_data=f"my_unenroll:{row.course_id}:{page_cursor}"
+            )
+        ])
+
+    navigation = navigation_row(
+        "my_courses",
+        rows[0].id,
+        rows[-1].id,
+        has_prev,
+        has_next,
+        lang
+    )
+    if navigation:
+        buttons.append(navigation)
+
+    return "\n\n".join(blocks), InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
 @my_courses_router.message(Command("mycourses"))
-@my_courses_router.message(
-    F.text.in_(["Мои курсы", "My Courses", "Mening kurslarim"])
-)
-async def show_my_courses(message: types.Message) -> None:
+@my_courses_router.message(MenuButton("btn_my_courses"))
+async def show_my_courses(message: types.Message, lang: str) -> None:
     """
     Показать курсы, на которые записан пользователь.
 
+    Все курсы выводятся одним сообщением постранично.
+
     Args:
         message: Входящее сообщение
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(message.from_user.id)
-
-    async with async_session() as session:
-        result_user = await session.execute(
-            select(User).where(User.user_id == message.from_user.id)
-        )
-        user = result_user.scalar_one_or_none()
-
-        if not user:
-            await message.answer(get_text("not_registered", lang))
-            return
-
-        result = await session.execute(
-            select(Enrollment)
-            .options(selectinload(Enrollment.course))
-            .where(Enrollment.user_id == user.id)
-        )
-        enrollments = result.scalars().all()
-
-    if not enrollments:
-        await message.answer(get_text("no_my_courses", lang))
-        return
+    text, keyboard = await build_my_courses_page(message.from_user.id, lang)
+    await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
 
-    for enr in enrollments:
-        course = enr.course
 
-        if enr.is_completed:
-            status = get_text("status_completed", lang)
-        else:
-            end_date_str = (
-                enr.end_date.strftime("%d.%m.%Y")
-                if enr.end_date
-                else get_text("not_indicated", lang)
-            )
-            status = get_text("status_until", lang, date=end_date_str)
+@my_courses_router.callback_query(F.data.startswith("my_courses:"))
+async def paginate_my_courses(callback: types.CallbackQuery, lang: str) -> None:
+    """
+    Перелистнуть страницу списка курсов пользователя.
 
-        text = (
-            f"📘 <b>{course.title}</b>\n\n"
-            f"{course.description or get_text('no_description', lang)}\n\n"
-            f"{get_text('price', lang, price=course.price)}\n\n"
-            f"{get_text('status', lang, status=status)}"
-        )
+    Args:
+        callback: Callback query вида my_courses:next:<ID> или
+            my_courses:prev:<ID>
+        lang: Код языка пользователя
+    """
+    after_id, before_id = parse_page_callback(callback.data)
+    text, keyboard = await build_my_courses_page(
+        callback.from_user.id,
+        lang,
+        after_id,
+        before_id
+    )
+
+    await callback.message.edit_text(
+        text,
+        reply_markup=keyboard,
+        parse_mode="HTML"
+    )
+    await callback.answer()
+
+
+@my_courses_router.callback_query(
+    F.data.startswith("my_unenroll:"),
+    flags={"throttle": ENROLL_THROTTLE}
+)
+async def unenroll_from_my_courses(
+    callback: types.CallbackQuery,
+    lang: str
+) -> None:
+    """
+    Отписаться от курса из списка и показать ту же страницу заново.
 
-        keyboard = InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text=get_text("btn_unenroll", lang),
-                        callback_data=f"unenroll:{course.id}"
-                    )
-                ]
-            ]
+    Args:
+        callback: Callback query вида my_unenroll:<ID курса>:<курсор>,
+            где курсор — after_id текущей страницы
+        lang: Код языка пользователя
+    """
+    _, course_id, page_cursor = callback.data.split(":")
+    page_cursor = int(page_cursor)
+
+    promoted = await remove_enrollment(callback.from_user.id, int(course_id))
+    if promoted is None:
+        await answer_not_enrolled(callback, lang)
+    else:
+        await callback.answer(get_text("unenrolled_success", lang))
+
+    text, keyboard = await build_my_courses_page(
+        callback.from_user.id,
+        lang,
+        page_cursor
+    )
+    # На странице был последний курс — показываем предыдущую
+    if keyboard is None and page_cursor > 0:
+        text, keyboard = await build_my_courses_page(
+            callback.from_user.id,
+            lang,
+            before_id=page_cursor + 1
         )
 
-        await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await callback.message.edit_text(
+        text,
+        reply_markup=keyboard,
+        parse_mode="HTML"
+    )
+    await notify_waitlist_promoted(promoted or [])
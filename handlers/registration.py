@@ -9,11 +9,13 @@ from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 
 from db.models import User
-from db.session import async_session
+from db.session import async_session, async_write_session
 from fsm.registration import Registration
 from config.bot_config import ADMIN_ID
 from keyboards.reply import main_menu
 from i18n.locales import get_text
+from i18n.menu import MenuButton
+from middlewares.user_context import language_cache, user_language
 
 # Константы валидации
 MIN_AGE = 1
@@ -23,31 +25,13 @@ MIN_NAME_LENGTH = 2
 registration_router = Router()
 
 
-async def get_user_language(user_id: int) -> str:
-    """
-    Получить язык пользователя из БД.
-
-    Args:
-        user_id: Telegram ID пользователя
-
-    Returns:
-        Код языка (ru/en/uz), по умолчанию 'ru'
-    """
-    async with async_session() as session:
-        result = await session.execute(
-            select(User).where(User.user_id == user_id)
-        )
-        user = result.scalar_one_or_none()
-        return user.language if user and user.language else "ru"
-
-
 @registration_router.message(Command("register"))
-@registration_router.message(
-    F.text.in_(["Регистрация", "Registration", "Ro'yxatdan o'tish"])
-)
+@registration_router.message(MenuButton("btn_registration"))
 async def start_registration(
     message: types.Message,
-    state: FSMContext
+    state: FSMContext,
+    user: User | None,
+    lang: str
 ) -> None:
     """
     Начать процесс регистрации.
@@ -55,15 +39,9 @@ async def start_registration(
     Args:
         message: Входящее сообщение
         state: FSM контекст
+        user: Пользователь из БД или None
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(message.from_user.id)
-
-    async with async_session() as session:
-        result = await session.execute(
-            select(User).where(User.user_id == message.from_user.id)
-        )
-        user = result.scalar_one_or_none()
-
     if user and user.name and user.is_active:
         await message.answer(
             get_text(
@@ -84,30 +62,38 @@ async def start_registration(
     Registration.name,
     F.text.func(lambda text: len(text) >= MIN_NAME_LENGTH)
 )
-async def process_name(message: types.Message, state: FSMContext) -> None:
+async def process_name(
+    message: types.Message,
+    state: FSMContext,
+    lang: str
+) -> None:
     """
     Обработать введённое имя.
 
     Args:
         message: Сообщение с именем
         state: FSM контекст
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(message.from_user.id)
     await state.update_data(name=message.text.strip())
     await message.answer(get_text("enter_age", lang))
     await state.set_state(Registration.age)
 
 
 @registration_router.message(Registration.age, F.text.regexp(r"^\d{1,3}$"))
-async def process_age(message: types.Message, state: FSMContext) -> None:
+async def process_age(
+    message: types.Message,
+    state: FSMContext,
+    lang: str
+) -> None:
     """
     Обработать введённый возраст.
 
     Args:
         message: Сообщение с возрастом
         state: FSM контекст
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(message.from_user.id)
     age = int(message.text)
 
     if not (MIN_AGE <= age <= MAX_AGE):
@@ -123,15 +109,19 @@ async def process_age(message: types.Message, state: FSMContext) -> None:
     Registration.phone,
     F.text.regexp(r"^\+?\d{10,15}$")
 )
-async def process_phone(message: types.Message, state: FSMContext) -> None:
+async def process_phone(
+    message: types.Message,
+    state: FSMContext,
+    lang: str
+) -> None:
     """
     Обработать введённый номер телефона.
 
     Args:
         message: Сообщение с номером телефона
         state: FSM контекст
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(message.from_user.id)
     phone = message.text.strip()
 
     async with async_session() as session:
@@ -151,15 +141,19 @@ async def process_phone(message: types.Message, state: FSMContext) -> None:
 
 
 @registration_router.message(Registration.photo, F.photo)
-async def process_photo(message: types.Message, state: FSMContext) -> None:
+async def process_photo(
+    message: types.Message,
+    state: FSMContext,
+    lang: str
+) -> None:
     """
     Обработать отправленное фото.
 
     Args:
         message: Сообщение с фото
         state: FSM контекст
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(message.from_user.id)
     await state.update_data(photo=message.photo[-1].file_id)
     await message.answer(get_text("send_document", lang))
     await state.set_state(Registration.document)
@@ -171,7 +165,9 @@ async def process_photo(message: types.Message, state: FSMContext) -> None:
 )
 async def process_document(
     message: types.Message,
-    state: FSMContext
+    state: FSMContext,
+    user: User | None,
+    lang: str
 ) -> None:
     """
     Обработать отправленный документ и завершить регистрацию.
@@ -179,8 +175,9 @@ async def process_document(
     Args:
         message: Сообщение с документом
         state: FSM контекст
+        user: Пользователь из БД или None
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(message.from_user.id)
     bot = message.bot
     mime = message.document.mime_type or ""
 
@@ -192,22 +189,17 @@ async def process_document(
     await state.update_data(document=message.document.file_id)
     data = await state.get_data()
 
-    # Проверяем, есть ли уже пользователь с таким user_id
-    async with async_session() as session:
-        result = await session.execute(
-            select(User).where(User.user_id == message.from_user.id)
-        )
-        existing_user = result.scalar_one_or_none()
-
-        if existing_user:
+    async with async_write_session() as session:
+        if user:
             # Обновляем существующего пользователя
-            existing_user.name = data["name"]
-            existing_user.age = data["age"]
-            existing_user.phone = data["phone"]
-            existing_user.photo = data["photo"]
-            existing_user.document = data["document"]
-            existing_user.is_active = True
-            new_user = existing_user
+            session.add(user)
+            user.name = data["name"]
+            user.age = data["age"]
+            user.phone = data["phone"]
+            user.photo = data["photo"]
+            user.document = data["document"]
+            user.is_active = True
+            new_user = user
         else:
             # Создаем нового пользователя
             new_user = User(
@@ -229,6 +221,8 @@ async def process_document(
             await state.clear()
             return
 
+    language_cache.set(message.from_user.id, user_language(new_user))
+
     # Уведомление админу
     notify_text = get_text(
         "new_user_notification",
@@ -3,73 +3,56 @@
 """
 from aiogram import Router, types, F
 from aiogram.filters import Command
-from sqlalchemy import select
 
 from keyboards.reply import main_menu, language_keyboard
 from db.models import User
-from db.session import async_session
+from db.session import async_write_session
 from i18n.locales import get_text
+from i18n.menu import MenuButton
+from middlewares.user_context import language_cache
 
 start_router = Router()
 
 
-async def get_user_language(user_id: int) -> str:
-    """
-    Получить язык пользователя из БД.
-    
-    Args:
-        user_id: Telegram ID пользователя
-        
-    Returns:
-        Код языка (ru/en/uz), по умолчанию 'ru'
-    """
-    async with async_session() as session:
-        result = await session.execute(
-            select(User).where(User.user_id == user_id)
-        )
-        user = result.scalar_one_or_none()
-        return user.language if user and user.language else "ru"
-
-
 @start_router.message(Command("start"))
-async def cmd_start(message: types.Message) -> None:
+async def cmd_start(message: types.Message, lang: str) -> None:
     """
     Обработчик команды /start.
     
     Args:
         message: Входящее сообщение от пользователя
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(message.from_user.id)
     await message.answer(
         get_text("welcome", lang),
         reply_markup=main_menu(message.from_user.id, lang)
     )
 
 
-@start_router.message(F.text.in_(["Старт", "Start", "Boshlash"]))
-async def start_button_handler(message: types.Message) -> None:
+@start_router.message(MenuButton("btn_start"))
+async def start_button_handler(message: types.Message, lang: str) -> None:
     """
     Обработчик кнопки 'Старт' на разных языках.
     
     Args:
         message: Входящее сообщение от пользователя
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(message.from_user.id)
     await message.answer(
         get_text("welcome", lang),
         reply_markup=main_menu(message.from_user.id, lang)
     )
 
 
-@start_router.message(F.text.in_(["🌐 Язык", "🌐 Language", "🌐 Til"]))
-async def language_menu(message: types.Message) -> None:
+@start_router.message(MenuButton("btn_language"))
+async def language_menu(message: types.Message, lang: str) -> None:
     """
     Обработчик выбора языка.
     
     Args:
         message: Входящее сообщение от пользователя
+        lang: Код языка пользователя
     """
-    lang = await get_user_language(message.from_user.id)
     await message.answer(
         get_text("choose_language", lang),
         reply_markup=language_keyboard()
@@ -77,22 +60,22 @@ async def language_menu(message: types.Message) -> None:
 
 
 @start_router.callback_query(F.data.startswith("lang:"))
-async def set_language(callback: types.CallbackQuery) -> None:
+async def set_language(
+    callback: types.CallbackQuery,
+    user: User | None
+) -> None:
     """
     Установить язык пользователя.
     
     Args:
         callback: Callback query с выбранным языком
+        user: Пользователь из БД или None
     """
     new_lang = callback.data.split(":")[1]
     
-    async with async_session() as session:
-        result = await session.execute(
-            select(User).where(User.user_id == callback.from_user.id)
-        )
-        user = result.scalar_one_or_none()
-        
+    async with async_write_session() as session:
         if user:
+            session.add(user)
             user.language = new_lang
             await session.commit()
         else:
@@ -104,6 +87,8 @@ async def set_language(callback: types.CallbackQuery) -> None:
             )
             session.add(temp_user)
             await session.commit()
+
+    language_cache.set(callback.from_user.id, new_lang)
     
     await callback.message.edit_text(get_text("language_changed", new_lang))
     await callback.message.answer(
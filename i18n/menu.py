@@ -0,0 +1,31 @@
+"""
+Фильтр кнопок главного меню.
+Действие кнопки определяет MenuActionMiddleware одним поиском в обратном
+индексе BUTTON_ACTIONS на сообщение, поэтому обработчикам не нужно
+перечислять надписи кнопки на каждом языке.
+"""
+from aiogram.filters import BaseFilter
+from aiogram.types import Message
+
+from i18n.locales import MENU_BUTTONS
+
+
+class MenuButton(BaseFilter):
+    """
+    Пропускает сообщения с текстом кнопки меню на любом языке.
+
+    Args:
+        action: Ключ кнопки из MENU_BUTTONS, например "btn_courses"
+    """
+
+    def __init__(self, action: str) -> None:
+        if action not in MENU_BUTTONS:
+            raise ValueError(f"Неизвестная кнопка меню: {action}")
+        self.action = action
+
+    async def __call__(
+        self,
+        message: Message,
+        menu_action: str | None = None
+    ) -> bool:
+        return menu_action == self.action
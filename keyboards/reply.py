@@ -10,8 +10,21 @@ from aiogram.types import (
 )
 from aiogram.utils.keyboard import ReplyKeyboardBuilder
 
-from config.bot_config import ADMIN_ID
-from i18n.locales import get_text, AVAILABLE_LANGUAGES
+from config.bot_config import ADMIN_IDS
+from i18n.locales import (
+    get_text,
+    on_reload,
+    AVAILABLE_LANGUAGES,
+    BASE_LANGUAGE,
+    TRANSLATIONS
+)
+
+# Готовые клавиатуры: строятся на каждый язык и роль при импорте модуля
+# и после перечитывания переводов. Разметка aiogram неизменяема (frozen),
+# поэтому один объект безопасно отдавать во все ответы.
+_main_menus: dict[tuple[str, bool], ReplyKeyboardMarkup] = {}
+_admin_main_keyboards: dict[str, InlineKeyboardMarkup] = {}
+_admin_back_keyboards: dict[str, InlineKeyboardMarkup] = {}
 
 
 def _is_admin(user_id: int) -> bool:
@@ -24,24 +37,22 @@ def _is_admin(user_id: int) -> bool:
     Returns:
         True, если пользователь администратор, иначе False
     """
-    try:
-        if isinstance(ADMIN_ID, (list, tuple, set)):
-            return int(user_id) in [int(x) for x in ADMIN_ID]
-        return int(user_id) == int(ADMIN_ID)
-    except (ValueError, TypeError):
-        return False
+    return user_id in ADMIN_IDS
 
 
-def main_menu(user_id: int, lang: str = "ru") -> ReplyKeyboardMarkup:
+def _lang_key(lang: str) -> str:
+    """Язык клавиатуры: незагруженный язык заменяется базовым (как в get_text)."""
+    return lang if lang in _admin_back_keyboards else BASE_LANGUAGE
+
+
+def _build_main_menu(lang: str, is_admin: bool) -> ReplyKeyboardMarkup:
     """
-    Создать главное меню для пользователя.
-    
-    Меню отличается для администраторов и обычных пользователей.
-    
+    Построить главное меню для роли и языка.
+
     Args:
-        user_id: Telegram ID пользователя
         lang: Код языка интерфейса
-        
+        is_admin: Меню администратора
+
     Returns:
         ReplyKeyboardMarkup с кнопками главного меню
     """
@@ -55,7 +66,7 @@ def main_menu(user_id: int, lang: str = "ru") -> ReplyKeyboardMarkup:
     builder.row(KeyboardButton(text=get_text("btn_auth", lang)))
     builder.row(KeyboardButton(text=get_text("btn_courses", lang)))
 
-    if _is_admin(user_id):
+    if is_admin:
         # Кнопки для администратора
         builder.row(
             KeyboardButton(text=get_text("btn_admin_certificates", lang))
@@ -78,14 +89,9 @@ def main_menu(user_id: int, lang: str = "ru") -> ReplyKeyboardMarkup:
     return builder.as_markup(resize_keyboard=True, one_time_keyboard=False)
 
 
-def language_keyboard() -> InlineKeyboardMarkup:
-    """
-    Создать клавиатуру для выбора языка.
-    
-    Returns:
-        InlineKeyboardMarkup с кнопками выбора языка
-    """
-    keyboard = InlineKeyboardMarkup(
+def _build_language_keyboard() -> InlineKeyboardMarkup:
+    """Построить клавиатуру выбора языка."""
+    return InlineKeyboardMarkup(
         inline_keyboard=[
             [
                 InlineKeyboardButton(
@@ -96,19 +102,10 @@ def language_keyboard() -> InlineKeyboardMarkup:
             for code, name in AVAILABLE_LANGUAGES.items()
         ]
     )
-    return keyboard
 
 
-def admin_main_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
-    """
-    Создать главную клавиатуру администратора.
-    
-    Args:
-        lang: Код языка интерфейса
-        
-    Returns:
-        InlineKeyboardMarkup с кнопками администратора
-    """
+def _build_admin_main_keyboard(lang: str) -> InlineKeyboardMarkup:
+    """Построить главную клавиатуру администратора для языка."""
     return InlineKeyboardMarkup(
         inline_keyboard=[
             [
@@ -145,16 +142,8 @@ def admin_main_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     )
 
 
-def admin_back_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
-    """
-    Создать клавиатуру возврата в меню администратора.
-    
-    Args:
-        lang: Код языка интерфейса
-        
-    Returns:
-        InlineKeyboardMarkup с кнопкой возврата
-    """
+def _build_admin_back_keyboard(lang: str) -> InlineKeyboardMarkup:
+    """Построить клавиатуру возврата в меню администратора для языка."""
     return InlineKeyboardMarkup(
         inline_keyboard=[
             [
@@ -165,3 +154,84 @@ def admin_back_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
             ]
         ]
     )
+
+
+def build_keyboards() -> None:
+    """
+    Построить клавиатуры для всех загруженных языков и ролей.
+
+    Вызывается при импорте модуля и после перечитывания переводов.
+    """
+    main_menus = {}
+    admin_main_keyboards = {}
+    admin_back_keyboards = {}
+    for lang in TRANSLATIONS:
+        for is_admin in (False, True):
+            main_menus[lang, is_admin] = _build_main_menu(lang, is_admin)
+        admin_main_keyboards[lang] = _build_admin_main_keyboard(lang)
+        admin_back_keyboards[lang] = _build_admin_back_keyboard(lang)
+
+    _main_menus.clear()
+    _main_menus.update(main_menus)
+    _admin_main_keyboards.clear()
+    _admin_main_keyboards.update(admin_main_keyboards)
+    _admin_back_keyboards.clear()
+    _admin_back_keyboards.update(admin_back_keyboards)
+
+
+def main_menu(user_id: int, lang: str = "ru") -> ReplyKeyboardMarkup:
+    """
+    Получить главное меню для пользователя.
+    
+    Меню отличается для администраторов и обычных пользователей.
+    
+    Args:
+        user_id: Telegram ID пользователя
+        lang: Код языка интерфейса
+        
+    Returns:
+        ReplyKeyboardMarkup с кнопками главного меню
+    """
+    return _main_menus[_lang_key(lang), _is_admin(user_id)]
+
+
+def language_keyboard() -> InlineKeyboardMarkup:
+    """
+    Получить клавиатуру для выбора языка.
+    
+    Returns:
+        InlineKeyboardMarkup с кнопками выбора языка
+    """
+    return _language_keyboard
+
+
+def admin_main_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
+    """
+    Получить главную клавиатуру администратора.
+    
+    Args:
+        lang: Код языка интерфейса
+        
+    Returns:
+        InlineKeyboardMarkup с кнопками администратора
+    """
+    return _admin_main_keyboards[_lang_key(lang)]
+
+
+def admin_back_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
+    """
+    Получить клавиатуру возврата в меню администратора.
+    
+    Args:
+        lang: Код языка интерфейса
+        
+    Returns:
+        InlineKeyboardMarkup с кнопкой возврата
+    """
+    return _admin_back_keyboards[_lang_key(lang)]
+
+
+# Клавиатура выбора языка не зависит от переводов
+_language_keyboard = _build_language_keyboard()
+build_keyboards()
+on_reload(build_keyboards)
@@ -6,9 +6,10 @@
 """
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
-from aiogram.fsm.storage.memory import MemoryStorage
 
 from config.bot_config import API_TOKEN
+from fsm.storage import create_storage
+from outbox import Outbox
 
 # Инициализация бота с HTML parse mode по умолчанию
 bot = Bot(
@@ -16,5 +17,8 @@ bot = Bot(
     default=DefaultBotProperties(parse_mode="HTML")
 )
 
-# Инициализация диспетчера с хранилищем в памяти
-dp = Dispatcher(storage=MemoryStorage())
+# Все отправки идут через очередь: порядок в чате, приоритеты, общий лимит
+bot.session.middleware(Outbox())
+
+# Инициализация диспетчера с хранилищем FSM из настроек
+dp = Dispatcher(storage=create_storage())
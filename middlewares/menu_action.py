@@ -0,0 +1,30 @@
+"""
+Middleware распознавания кнопок главного меню.
+Текст сообщения один раз за апдейт ищется в обратном индексе
+BUTTON_ACTIONS, и найденное действие кладётся в data['menu_action']
+для фильтров MenuButton.
+"""
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import Message
+
+from i18n.locales import BUTTON_ACTIONS
+
+
+class MenuActionMiddleware(BaseMiddleware):
+    """
+    Внешний middleware для сообщений.
+
+    Должен быть внешним: фильтры обработчиков проверяются
+    до внутренних middleware.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[Message, dict[str, Any]], Awaitable[Any]],
+        event: Message,
+        data: dict[str, Any]
+    ) -> Any:
+        data["menu_action"] = BUTTON_ACTIONS.get(event.text) if event.text else None
+        return await handler(event, data)
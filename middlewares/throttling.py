@@ -0,0 +1,256 @@
+"""
+Middleware ограничения частоты апдейтов от одного пользователя.
+Каждому пользователю выдаётся ведро токенов (общее или отдельное
+для обработчика); апдейты сверх лимита и повторы ещё не обработанного
+апдейта отбрасываются до обращения к БД, на callback-запросы
+отвечается пустым answer(), чтобы у клиента пропали «часики».
+"""
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import CallbackQuery, Message, TelegramObject
+
+from config.bot_config import (
+    ADMIN_IDS,
+    THROTTLE_RATE,
+    THROTTLE_BURST,
+    THROTTLE_STORAGE,
+    THROTTLE_REDIS_URL,
+    THROTTLE_CACHE_SIZE
+)
+from utils.cache import LRUCache
+from utils.rate_limit import TokenBucket
+
+# Атомарное ведро токенов в Redis: пополнение по времени сервера,
+# ключ истекает, когда ведро успело бы наполниться целиком
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + (now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return allowed
+"""
+
+
+class MemoryThrottleBackend:
+    """
+    Вёдра токенов в памяти процесса.
+
+    Все апдейты пользователя обрабатываются в одном процессе
+    (см. sharding.py), поэтому локальных вёдер достаточно.
+
+    Args:
+        maxsize: Сколько вёдер хранить; давно не использованные вытесняются
+    """
+
+    def __init__(self, maxsize: int = THROTTLE_CACHE_SIZE) -> None:
+        self._buckets = LRUCache(maxsize=maxsize)
+
+    async def try_acquire(self, key: str, rate: float, burst: int) -> bool:
+        """
+        Взять токен из ведра без ожидания.
+
+        Args:
+            key: Ключ ведра (пользователь и область лимита)
+            rate: Токенов в секунду (0 и меньше — без ограничения)
+            burst: Ёмкость ведра
+
+        Returns:
+            True, если апдейт можно обработать
+        """
+        if rate <= 0:
+            return True
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(rate, burst)
+            self._buckets.set(key, bucket)
+        return bucket.try_acquire()
+
+
+class RedisThrottleBackend:
+    """
+    Вёдра токенов в Redis, общие для нескольких инстансов бота.
+
+    При недоступности Redis апдейты пропускаются без ограничения.
+
+    Args:
+        url: Адрес Redis
+    """
+
+    def __init__(self, url: str = THROTTLE_REDIS_URL) -> None:
+        from redis.asyncio import Redis
+
+        self._redis = Redis.from_url(url)
+        self._script = self._redis.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def try_acquire(self, key: str, rate: float, burst: int) -> bool:
+        """
+        Взять токен из ведра без ожидания.
+
+        Args:
+            key: Ключ ведра (пользователь и область лимита)
+            rate: Токенов в секунду (0 и меньше — без ограничения)
+            burst: Ёмкость ведра
+
+        Returns:
+            True, если апдейт можно обработать
+        """
+        if rate <= 0:
+            return True
+        try:
+            allowed = await self._script(
+                keys=[f"throttle:{key}"],
+                args=[rate, burst]
+            )
+        except Exception as e:
+            print(f"Ошибка ограничителя частоты в Redis: {e}")
+            return True
+        return bool(allowed)
+
+
+def create_throttle_backend() -> MemoryThrottleBackend | RedisThrottleBackend:
+    """
+    Создать хранилище вёдер согласно настройке THROTTLE_STORAGE.
+
+    Для redis нужен пакет redis.
+
+    Returns:
+        Хранилище вёдер токенов
+    """
+    if THROTTLE_STORAGE == "redis":
+        return RedisThrottleBackend()
+    return MemoryThrottleBackend()
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Внутренний middleware для сообщений и callback-запросов.
+
+    Лимит по умолчанию — THROTTLE_RATE апдейтов в секунду со всплеском
+    до THROTTLE_BURST. Обработчик может задать свой лимит флагом:
+    flags={"throttle": {"key": "enroll", "rate": 0.5, "burst": 2}}
+    (key — отдельное ведро для обработчика) или отключить его
+    флагом {"throttle": False}. Флаг другого вида (например, True)
+    означает лимит по умолчанию. Флаг проверяется один раз на
+    обработчик: rate <= 0 заменяется лимитом по умолчанию, burst < 1 —
+    единицей. Администраторы не ограничиваются.
+
+    Args:
+        backend: Хранилище вёдер; по умолчанию согласно THROTTLE_STORAGE
+        rate: Лимит по умолчанию, апдейтов в секунду (0 — без ограничения)
+        burst: Допустимый всплеск по умолчанию
+    """
+
+    def __init__(
+        self,
+        backend: MemoryThrottleBackend | RedisThrottleBackend | None = None,
+        rate: float = THROTTLE_RATE,
+        burst: int = THROTTLE_BURST
+    ) -> None:
+        self.backend = backend or create_throttle_backend()
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._in_flight: set[tuple[int, str]] = set()
+        # Проверенные флаги: id объекта обработчика → (обработчик, лимит).
+        # Ссылка на обработчик не даёт его id достаться другому объекту
+        self._limits: dict[int, tuple[Any, tuple[str, float, int] | None]] = {}
+
+    def _limit(self, data: dict[str, Any]) -> tuple[str, float, int] | None:
+        """
+        Лимит обработчика по флагу throttle.
+
+        Флаг проверяется при первом апдейте обработчика, об ошибках
+        сообщается один раз.
+
+        Args:
+            data: Данные апдейта с объектом обработчика
+
+        Returns:
+            Кортеж (ключ ведра, rate, burst) или None без ограничения
+        """
+        handler = data.get("handler")
+        cache_key = id(handler)
+        if cache_key in self._limits:
+            return self._limits[cache_key][1]
+
+        throttle = get_flag(data, "throttle", default={})
+        if throttle is False:
+            limit = None
+        else:
+            if not isinstance(throttle, dict):
+                throttle = {}
+            name = getattr(getattr(handler, "callback", None), "__name__", "?")
+            rate = throttle.get("rate", self.rate)
+            if rate <= 0:
+                print(f"Ошибка флага throttle у {name}: rate должен быть больше 0, получено {rate}; используется {self.rate}")
+                rate = self.rate
+            burst = throttle.get("burst", self.burst)
+            if burst < 1:
+                print(f"Ошибка флага throttle у {name}: burst должен быть не меньше 1, получено {burst}; используется 1")
+                burst = 1
+            limit = (throttle.get("key", "default"), rate, burst)
+
+        if handler is not None:
+            self._limits[cache_key] = (handler, limit)
+        return limit
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any]
+    ) -> Any:
+        from_user = data.get("event_from_user")
+        if not from_user or self.rate <= 0 or from_user.id in ADMIN_IDS:
+            return await handler(event, data)
+
+        limit = self._limit(data)
+        if limit is None:
+            return await handler(event, data)
+        key, rate, burst = limit
+
+        # Повтор того же нажатия или текста, пока первый ещё
+        # обрабатывается, не обрабатываем второй раз
+        payload = None
+        if isinstance(event, CallbackQuery):
+            payload = event.data
+        elif isinstance(event, Message):
+            payload = event.text
+        duplicate_key = (from_user.id, payload) if payload else None
+
+        allowed = duplicate_key not in self._in_flight and (
+            await self.backend.try_acquire(
+                f"{from_user.id}:{key}",
+                rate,
+                burst
+            )
+        )
+
+        if not allowed:
+            if isinstance(event, CallbackQuery):
+                try:
+                    await event.answer()
+                except Exception as e:
+                    print(f"Ошибка ответа на отброшенный callback: {e}")
+            return None
+
+        if duplicate_key is None:
+            return await handler(event, data)
+
+        self._in_flight.add(duplicate_key)
+        try:
+            return await handler(event, data)
+        finally:
+            self._in_flight.discard(duplicate_key)
@@ -0,0 +1,114 @@
+"""
+Middleware загрузки пользователя из БД.
+Определяет язык интерфейса по кешу и загружает строку пользователя
+не более одного раза за апдейт.
+"""
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+from sqlalchemy import select
+
+from config.bot_config import LANGUAGE_CACHE_SIZE, LANGUAGE_CACHE_TTL
+from db.models import User
+from db.session import async_session
+from utils.cache import LRUCache
+
+DEFAULT_LANGUAGE = "ru"
+
+# Кеш Telegram ID → язык; обновляется при каждом изменении языка
+language_cache = LRUCache(
+    maxsize=LANGUAGE_CACHE_SIZE,
+    ttl=LANGUAGE_CACHE_TTL
+)
+
+
+async def load_user(user_id: int) -> User | None:
+    """
+    Загрузить пользователя по Telegram ID и обновить кеш языка.
+
+    Args:
+        user_id: Telegram ID пользователя
+
+    Returns:
+        Строка User (отсоединённая от сессии) или None
+    """
+    async with async_session() as session:
+        result = await session.execute(
+            select(User).where(User.user_id == user_id)
+        )
+        user = result.scalar_one_or_none()
+
+    language_cache.set(user_id, user_language(user))
+    return user
+
+
+def user_language(user: User | None) -> str:
+    """
+    Получить язык пользователя с учётом значения по умолчанию.
+
+    Args:
+        user: Строка User или None
+
+    Returns:
+        Код языка (ru/en/uz), по умолчанию 'ru'
+    """
+    return user.language if user and user.language else DEFAULT_LANGUAGE
+
+
+class UserMiddleware(BaseMiddleware):
+    """
+    Внешний middleware диспетчера.
+
+    Добавляет в данные обработчика lang — код языка пользователя.
+    При промахе кеша язык берётся из БД, и загруженная строка
+    сразу кладётся в data['user'], чтобы не читать её повторно.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any]
+    ) -> Any:
+        from_user = data.get("event_from_user")
+        lang = DEFAULT_LANGUAGE
+
+        if from_user:
+            lang = language_cache.get(from_user.id)
+            if lang is None:
+                user = await load_user(from_user.id)
+                data["user"] = user
+                lang = user_language(user)
+
+        data["lang"] = lang
+        return await handler(event, data)
+
+
+class UserLoaderMiddleware(BaseMiddleware):
+    """
+    Внутренний middleware для сообщений и callback-запросов.
+
+    Загружает строку User только для обработчиков, которые принимают
+    аргумент user, и только если она ещё не загружена в этом апдейте.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any]
+    ) -> Any:
+        handler_object = data.get("handler")
+        from_user = data.get("event_from_user")
+
+        if (
+            "user" not in data
+            and handler_object
+            and "user" in handler_object.params
+        ):
+            data["user"] = (
+                await load_user(from_user.id) if from_user else None
+            )
+
+        return await handler(event, data)
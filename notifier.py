@@ -2,101 +2,329 @@
 """
 Модуль планировщика уведомлений о начале и окончании курсов.
 Использует APScheduler для отправки уведомлений пользователям.
+
+Каждое уведомление перед отправкой «захватывается» строкой
+в notification_log (уникальна по записи на курс, виду и дате),
+поэтому перезапуск бота или несколько его копий не приводят
+к повторной отправке, а прерванная рассылка продолжается
+с того места, где остановилась: пока за день остаются
+неотправленные уведомления, через CLAIM_TIMEOUT запускается
+повторная рассылка, которая перехватывает брошенные захваты.
 """
-from datetime import datetime
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from uuid import uuid4
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from sqlalchemy import select
+from sqlalchemy import (
+    Date,
+    DateTime,
+    exists,
+    literal,
+    select,
+    union_all,
+    update
+)
 
-from db.session import async_session
-from db.models import Enrollment, User, Course
+from db.session import async_session, async_write_session, dialect_insert
+from db.models import Enrollment, NotificationLog, User, Course
 from loader import bot
 from i18n.locales import get_text
+from broadcaster import Broadcaster, BroadcastReport
 
 # Создаём планировщик с часовым поясом Ташкента
 scheduler = AsyncIOScheduler(timezone="Asia/Tashkent")
 
+# Все рассылки идут через общий движок с лимитами Telegram
+broadcaster = Broadcaster(bot)
+
+# Время ежедневной рассылки
+NOTIFY_HOUR = 9
+NOTIFY_MINUTE = 0
+
+# Виды уведомлений в notification_log
+KIND_COURSE_START = "course_start"
+KIND_COURSE_END = "course_end"
+
+# Через сколько захват считается брошенным (упавшая копия бота)
+CLAIM_TIMEOUT = timedelta(minutes=10)
 
-async def notify_start_course() -> None:
+# ID задачи повторной рассылки (одна на планировщик)
+RETRY_JOB_ID = "notify_courses_retry"
+
+# Сколько записей журнала отправлять за один проход
+NOTIFY_BATCH_SIZE = 500
+
+
+async def claim_notifications(today, token: str) -> None:
     """
-    Уведомить пользователей о начале курсов сегодня.
+    Захватить сегодняшние уведомления для этой копии бота.
+
+    Строки журнала создаются одним INSERT ... SELECT с
+    ON CONFLICT DO NOTHING: уже захваченные другой копией или
+    отправленные ранее уведомления пропускаются. Брошенные
+    захваты (pending дольше CLAIM_TIMEOUT) перехватываются.
 
-    Проверяет все записи, где start_date равна сегодняшней дате,
-    и отправляет уведомления соответствующим пользователям.
+    Args:
+        today: Сегодняшняя дата
+        token: Метка захвата этой рассылки
     """
-    today = datetime.now(scheduler.timezone).date()
+    now = datetime.now()
+    columns = (
+        literal(today, Date),
+        literal("pending"),
+        literal(token),
+        literal(now, DateTime)
+    )
 
-    async with async_session() as session:
-        result = await session.execute(
-            select(Enrollment, Course, User)
-            .join(Course, Enrollment.course_id == Course.id)
+    def due(kind: str, date_column):
+        return (
+            select(Enrollment.id, literal(kind), *columns)
             .join(User, Enrollment.user_id == User.id)
-            .where(Enrollment.start_date == today)
+            .where(date_column == today, User.user_id.is_not(None))
         )
-        rows = result.all()
 
-        for enr, course, user in rows:
-            if user and user.user_id:
-                try:
-                    lang = user.language or "ru"
-                    message_text = get_text(
-                        "course_starts_today",
-                        lang,
-                        title=course.title
-                    )
-                    await bot.send_message(
-                        user.user_id,
-                        message_text,
-                        parse_mode="HTML"
-                    )
-                except Exception as e:
-                    print(f"Ошибка при уведомлении о начале курса: {e}")
+    async with async_write_session() as session:
+        await session.execute(
+            dialect_insert(NotificationLog)
+            .from_select(
+                [
+                    "enrollment_id",
+                    "kind",
+                    "date",
+                    "status",
+                    "claim_token",
+                    "claimed_at"
+                ],
+                union_all(
+                    due(KIND_COURSE_START, Enrollment.start_date),
+                    due(KIND_COURSE_END, Enrollment.end_date)
+                )
+            )
+            .on_conflict_do_nothing(
+                index_elements=["enrollment_id", "kind", "date"]
+            )
+        )
+        await session.execute(
+            update(NotificationLog)
+            .where(
+                NotificationLog.date == today,
+                NotificationLog.status == "pending",
+                NotificationLog.claimed_at < now - CLAIM_TIMEOUT
+            )
+            .values(claim_token=token, claimed_at=now)
+        )
+        await session.commit()
 
 
-async def notify_end_course() -> None:
+async def claimed_notifications(
+    token: str
+) -> list[tuple[int, str, list[int]]]:
     """
-    Уведомить пользователей об окончании курсов сегодня.
+    Прочитать очередную порцию захваченных и ещё не отправленных
+    уведомлений.
 
-    Проверяет все записи, где end_date равна сегодняшней дате,
-    и отправляет уведомления соответствующим пользователям.
-    """
-    today = datetime.now(scheduler.timezone).date()
+    Уведомления одного пользователя объединяются в одно сообщение;
+    пользователь на границе порции целиком переносится в следующую.
+
+    Args:
+        token: Метка захвата этой рассылки
 
+    Returns:
+        Список (Telegram ID, текст сообщения, ID строк журнала)
+    """
     async with async_session() as session:
         result = await session.execute(
-            select(Enrollment, Course, User)
+            select(
+                NotificationLog.id,
+                NotificationLog.kind,
+                User.user_id,
+                User.language,
+                Course.title
+            )
+            .select_from(NotificationLog)
+            .join(Enrollment, NotificationLog.enrollment_id == Enrollment.id)
             .join(Course, Enrollment.course_id == Course.id)
             .join(User, Enrollment.user_id == User.id)
-            .where(Enrollment.end_date == today)
+            .where(
+                NotificationLog.claim_token == token,
+                NotificationLog.status == "pending"
+            )
+            .order_by(User.user_id, NotificationLog.id)
+            .limit(NOTIFY_BATCH_SIZE)
         )
         rows = result.all()
 
-        for enr, course, user in rows:
-            if user and user.user_id:
-                try:
-                    lang = user.language or "ru"
-                    message_text = get_text(
-                        "course_ends_today",
-                        lang,
-                        title=course.title
-                    )
-                    await bot.send_message(
-                        user.user_id,
-                        message_text,
-                        parse_mode="HTML"
+    if len(rows) == NOTIFY_BATCH_SIZE and rows[0].user_id != rows[-1].user_id:
+        last_user_id = rows[-1].user_id
+        rows = [row for row in rows if row.user_id != last_user_id]
+
+    messages = []
+    for row in rows:
+        if not messages or messages[-1][0] != row.user_id:
+            messages.append((row.user_id, [], []))
+        _, parts, log_ids = messages[-1]
+
+        key = (
+            "course_starts_today"
+            if row.kind == KIND_COURSE_START
+            else "course_ends_today"
+        )
+        parts.append(get_text(key, row.language or "ru", title=row.title))
+        log_ids.append(row.id)
+
+    return [
+        (user_id, "\n\n".join(parts), log_ids)
+        for user_id, parts, log_ids in messages
+    ]
+
+
+async def has_pending_notifications(today: date) -> bool:
+    """
+    Проверить, остались ли неотправленные уведомления за день.
+
+    Args:
+        today: Дата рассылки
+
+    Returns:
+        True, если есть строки журнала в статусе pending
+    """
+    async with async_session() as session:
+        return bool(
+            await session.scalar(
+                select(
+                    exists().where(
+                        NotificationLog.date == today,
+                        NotificationLog.status == "pending"
                     )
-                except Exception as e:
-                    print(f"Ошибка при уведомлении о конце курса: {e}")
+                )
+            )
+        )
+
+
+def schedule_retry(today: date) -> None:
+    """
+    Запланировать повторную рассылку за день через CLAIM_TIMEOUT.
+
+    К этому времени захваты упавшей рассылки становятся брошенными
+    и перехватываются. Повторная задача одна: новая заменяет старую.
+
+    Args:
+        today: Дата рассылки
+    """
+    scheduler.add_job(
+        notify_courses,
+        "date",
+        run_date=(
+            datetime.now(scheduler.timezone)
+            + CLAIM_TIMEOUT
+            + timedelta(seconds=5)
+        ),
+        args=[today],
+        id=RETRY_JOB_ID,
+        replace_existing=True,
+        misfire_grace_time=3600
+    )
+
+
+async def notify_courses(today: date | None = None) -> None:
+    """
+    Уведомить пользователей о начале и окончании курсов.
+
+    Безопасно запускать повторно и на нескольких копиях бота:
+    отправляются только уведомления, захваченные этим запуском.
+    Если после рассылки за день остались неотправленные уведомления
+    (их держит другая или упавшая рассылка), через CLAIM_TIMEOUT
+    запускается повторная.
+
+    Args:
+        today: Дата рассылки; по умолчанию сегодня
+    """
+    if today is None:
+        today = datetime.now(scheduler.timezone).date()
+    token = uuid4().hex
+    report = BroadcastReport()
+
+    await claim_notifications(today, token)
+
+    while True:
+        messages = await claimed_notifications(token)
+        if not messages:
+            break
+
+        log_ids = {user_id: ids for user_id, _, ids in messages}
+        statuses: dict[str, list[int]] = defaultdict(list)
+
+        def on_result(chat_id: int, status: str) -> None:
+            statuses[status].extend(log_ids[chat_id])
+
+        report.add(
+            await broadcaster.broadcast(
+                [(user_id, text) for user_id, text, _ in messages],
+                on_result=on_result,
+                parse_mode="HTML"
+            )
+        )
+
+        async with async_write_session() as session:
+            for status, ids in statuses.items():
+                await session.execute(
+                    update(NotificationLog)
+                    .where(NotificationLog.id.in_(ids))
+                    .values(status=status)
+                )
+            await session.commit()
+
+    print(f"Уведомления о курсах: {report}")
+
+    if await has_pending_notifications(today):
+        print(f"Остались неотправленные уведомления за {today}, повтор через {CLAIM_TIMEOUT}")
+        schedule_retry(today)
+
+
+async def notify_waitlist_promoted(promoted: list[tuple[int, str, str]]) -> None:
+    """
+    Сообщить пользователям, что их записали на курс из листа ожидания.
+
+    Args:
+        promoted: Список (Telegram ID, язык, название курса)
+    """
+    if not promoted:
+        return
+
+    report = await broadcaster.broadcast(
+        [
+            (user_id, get_text("waitlist_promoted", lang, title=title))
+            for user_id, lang, title in promoted
+        ],
+        parse_mode="HTML"
+    )
+    print(f"Уведомления из листа ожидания: {report}")
 
 
 def setup_scheduler() -> None:
     """
     Настроить и запустить планировщик уведомлений.
 
-    Добавляет задачи на уведомление о начале и окончании курсов.
-    Уведомления отправляются каждый день в 9:00.
+    Добавляет задачу на уведомление о начале и окончании курсов.
+    Уведомления отправляются каждый день в 9:00; если бот запущен
+    позже, неотправленные сегодняшние уведомления досылаются сразу,
+    а захваченные упавшим запуском — повторной рассылкой
+    через CLAIM_TIMEOUT.
     """
     # Уведомления каждый день в 9:00
-    scheduler.add_job(notify_start_course, "cron", hour=9, minute=0)
-    scheduler.add_job(notify_end_course, "cron", hour=9, minute=0)
+    scheduler.add_job(
+        notify_courses,
+        "cron",
+        hour=NOTIFY_HOUR,
+        minute=NOTIFY_MINUTE,
+        coalesce=True,
+        misfire_grace_time=3600
+    )
+
+    # Бот перезапустился после 9:00 — досылаем пропущенное
+    now = datetime.now(scheduler.timezone)
+    if (now.hour, now.minute) >= (NOTIFY_HOUR, NOTIFY_MINUTE):
+        scheduler.add_job(notify_courses)
+
     scheduler.start()
@@ -0,0 +1,250 @@
+# ============ outbox.py ============
+"""
+Очередь исходящих запросов к Telegram.
+
+Подключается middleware к сессии бота, поэтому через неё проходят все
+отправки и правки сообщений — и ответы обработчиков, и рассылки:
+- в одном чате запросы одного приоритета выполняются строго по очереди
+  (FIFO), интерактивные ответы не ждут запросов рассылки в этом чате;
+- общий лимит OUTBOX_RATE запросов в секунду на весь бот (при
+  SHARD_WORKERS > 1 делится поровну между процессами), свободные
+  слоты сначала получают интерактивные ответы, затем рассылки;
+- правка сообщения, ещё не отправленная в Telegram, заменяется более
+  новой правкой того же сообщения (вызывающие получают один результат).
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (
+    CopyMessage,
+    DeleteMessage,
+    EditMessageCaption,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    ForwardMessage,
+    SendDocument,
+    SendMediaGroup,
+    SendMessage,
+    SendPhoto,
+    TelegramMethod
+)
+
+from config.bot_config import OUTBOX_RATE, SHARD_WORKERS
+from utils.rate_limit import TokenBucket
+
+# Классы приоритета: меньше — раньше
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BROADCAST = 10
+
+# Приоритет запросов текущей задачи; рассылки выставляют свой
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "outbox_priority",
+    default=PRIORITY_INTERACTIVE
+)
+
+# Запросы, которые идут через очередь (у остальных нет чата или
+# они должны выполняться сразу, как answer_callback_query)
+QUEUED_METHODS = (
+    SendMessage,
+    SendPhoto,
+    SendDocument,
+    SendMediaGroup,
+    CopyMessage,
+    ForwardMessage,
+    EditMessageText,
+    EditMessageCaption,
+    EditMessageReplyMarkup,
+    DeleteMessage,
+)
+
+# Правки, которые можно заменить более новой правкой того же сообщения
+COALESCED_METHODS = (
+    EditMessageText,
+    EditMessageCaption,
+    EditMessageReplyMarkup,
+)
+
+
+def process_rate(
+    rate: float = OUTBOX_RATE,
+    shard_workers: int = SHARD_WORKERS
+) -> float:
+    """
+    Лимит очереди одного процесса.
+
+    При SHARD_WORKERS > 1 запросы отправляют главный процесс
+    (планировщик) и каждый обработчик, а очередь у каждого своя,
+    поэтому общий лимит делится между ними поровну.
+
+    Args:
+        rate: Общий лимит запросов в секунду
+        shard_workers: Количество процессов-обработчиков
+
+    Returns:
+        Лимит запросов в секунду для текущего процесса
+    """
+    if shard_workers > 1:
+        return rate / (shard_workers + 1)
+    return rate
+
+
+@contextmanager
+def outbox_priority(priority: int) -> Iterator[None]:
+    """
+    Выполнить запросы блока с заданным приоритетом.
+
+    Задачи, созданные внутри блока, наследуют приоритет.
+
+    Args:
+        priority: PRIORITY_INTERACTIVE или PRIORITY_BROADCAST
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@dataclass
+class _Job:
+    """Запрос в очереди чата."""
+
+    method: TelegramMethod
+    done: asyncio.Future = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+    started: bool = False
+
+
+class PriorityLimiter:
+    """
+    Общий лимит частоты, раздающий слоты по приоритету.
+
+    Args:
+        rate: Запросов в секунду
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.bucket = TokenBucket(rate)
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._task: asyncio.Task | None = None
+
+    async def acquire(self, priority: int) -> None:
+        """
+        Дождаться слота; среди ожидающих первым проходит
+        запрос с меньшим приоритетом, при равных — пришедший раньше.
+
+        Args:
+            priority: Класс приоритета
+        """
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters,
+            (priority, next(self._counter), future)
+        )
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._release())
+        await future
+
+    async def _release(self) -> None:
+        """Выдавать слоты, пока есть ожидающие."""
+        while self._waiters:
+            await self.bucket.acquire()
+            # Победитель выбирается после ожидания токена, чтобы
+            # пришедший за это время интерактивный запрос прошёл первым
+            while self._waiters:
+                _, _, future = heapq.heappop(self._waiters)
+                if not future.done():
+                    future.set_result(None)
+                    break
+
+
+class Outbox(BaseRequestMiddleware):
+    """
+    Middleware сессии бота: очередь исходящих запросов.
+
+    Args:
+        rate: Лимит запросов в секунду этого процесса (0 — без очереди)
+    """
+
+    def __init__(self, rate: float | None = None) -> None:
+        self.rate = process_rate() if rate is None else rate
+        self.limiter = PriorityLimiter(self.rate) if self.rate > 0 else None
+        # Последний запрос каждого чата и приоритета: следующий ждёт его
+        # завершения. Приоритеты не делят очередь, иначе ответ
+        # пользователю ждал бы отправки рассылки в тот же чат.
+        self._tails: dict[tuple[int | str, int], _Job] = {}
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot: Bot,
+        method: TelegramMethod
+    ) -> Any:
+        chat_id = getattr(method, "chat_id", None)
+        if (
+            self.limiter is None
+            or chat_id is None
+            or not isinstance(method, QUEUED_METHODS)
+        ):
+            return await make_request(bot, method)
+
+        priority = _priority.get()
+        tail_key = (chat_id, priority)
+        previous = self._tails.get(tail_key)
+
+        # Непосланная правка того же сообщения в конце очереди чата —
+        # отправляем только последнюю версию
+        if (
+            previous is not None
+            and not previous.started
+            and isinstance(method, COALESCED_METHODS)
+            and type(previous.method) is type(method)
+            and previous.method.message_id == method.message_id
+        ):
+            previous.method = method
+            return await asyncio.shield(previous.done)
+
+        job = _Job(method)
+        self._tails[tail_key] = job
+        try:
+            if previous is not None:
+                # Результат предыдущего запроса нас не касается
+                await asyncio.wait([previous.done])
+            await self.limiter.acquire(priority)
+
+            job.started = True
+            result = await make_request(bot, job.method)
+            job.done.set_result(result)
+            return result
+        except TelegramRetryAfter as e:
+            # Флуд-контроль касается всего бота: притормаживаем всех
+            self.limiter.bucket.pause(e.retry_after)
+            job.done.set_exception(e)
+            raise
+        except asyncio.CancelledError:
+            job.done.cancel()
+            raise
+        except Exception as e:
+            job.done.set_exception(e)
+            raise
+        finally:
+            # Ошибку заменённых правок забирает shield() вызывающих;
+            # без ожидающих не даём asyncio ругаться на неё
+            if job.done.done() and not job.done.cancelled():
+                job.done.exception()
+            if self._tails.get(tail_key) is job:
+                del self._tails[tail_key]
@@ -0,0 +1,219 @@
+"""
+Многопроцессная обработка апдейтов.
+
+Главный процесс получает апдейты (polling или webhook) и раскладывает
+их по процессам-обработчикам по Telegram ID отправителя. Все апдейты
+одного пользователя попадают в один процесс и обрабатываются там по
+порядку, поэтому сценарии FSM остаются согласованными, а разные
+пользователи обрабатываются на разных ядрах.
+"""
+import asyncio
+import multiprocessing
+import queue as queue_lib
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+
+from config.bot_config import (
+    BOT_MODE,
+    DROP_PENDING_UPDATES,
+    UPDATE_QUEUE_SIZE,
+    UPDATE_WORKERS
+)
+from update_queue import UpdateQueue, shard_key
+from webhook import run_webhook
+
+# Таймаут long polling в главном процессе (секунды)
+POLLING_TIMEOUT = 30
+
+
+class ShardedQueue:
+    """
+    Очереди процессов-обработчиков.
+
+    Args:
+        queues: По одной межпроцессной очереди на обработчик
+        processes: Процессы-обработчики
+    """
+
+    def __init__(
+        self,
+        queues: list[multiprocessing.Queue],
+        processes: list[multiprocessing.Process]
+    ) -> None:
+        self.queues = queues
+        self.processes = processes
+
+    def _queue_for(self, update: Update) -> multiprocessing.Queue:
+        return self.queues[shard_key(update) % len(self.queues)]
+
+    def put_nowait(self, update: Update) -> None:
+        """
+        Передать апдейт обработчику без ожидания.
+
+        Args:
+            update: Апдейт Telegram
+
+        Raises:
+            asyncio.QueueFull: Очередь обработчика переполнена
+        """
+        try:
+            self._queue_for(update).put_nowait(
+                update.model_dump_json(exclude_unset=True)
+            )
+        except queue_lib.Full:
+            raise asyncio.QueueFull from None
+
+    async def put(self, update: Update) -> None:
+        """
+        Передать апдейт обработчику, дождавшись места в очереди.
+
+        Args:
+            update: Апдейт Telegram
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None,
+            self._queue_for(update).put,
+            update.model_dump_json(exclude_unset=True)
+        )
+
+    def start(self) -> None:
+        """Запустить процессы-обработчики."""
+        for process in self.processes:
+            process.start()
+
+    async def stop(self) -> None:
+        """Попросить обработчики завершиться и дождаться их."""
+        loop = asyncio.get_running_loop()
+        for shard_queue in self.queues:
+            await loop.run_in_executor(None, shard_queue.put, None)
+        for process in self.processes:
+            await loop.run_in_executor(None, process.join)
+
+
+def worker_main(index: int, shard_queue: multiprocessing.Queue) -> None:
+    """
+    Точка входа процесса-обработчика.
+
+    Args:
+        index: Номер обработчика
+        shard_queue: Очередь апдейтов этого обработчика
+    """
+    asyncio.run(_run_worker(index, shard_queue))
+
+
+async def _run_worker(index: int, shard_queue: multiprocessing.Queue) -> None:
+    """
+    Обрабатывать апдейты из очереди до получения None.
+
+    Внутри процесса апдейты разных пользователей обрабатываются
+    параллельно пулом UpdateQueue.
+
+    Args:
+        index: Номер обработчика
+        shard_queue: Очередь апдейтов этого обработчика
+    """
+    # Импорт здесь: в новом процессе создаются свои бот и диспетчер
+    from bot import setup_dispatcher
+    from loader import bot, dp
+
+    setup_dispatcher(dp)
+    await dp.emit_startup(bot=bot)
+
+    updates = UpdateQueue(
+        dp,
+        bot,
+        workers=UPDATE_WORKERS,
+        maxsize=UPDATE_QUEUE_SIZE
+    )
+    updates.start()
+    loop = asyncio.get_running_loop()
+
+    try:
+        while True:
+            raw = await loop.run_in_executor(None, shard_queue.get)
+            if raw is None:
+                break
+            await updates.put(
+                Update.model_validate_json(raw, context={"bot": bot})
+            )
+    finally:
+        await updates.stop()
+        await dp.emit_shutdown(bot=bot)
+        await bot.session.close()
+        print(f"Обработчик {index} остановлен")
+
+
+async def poll_updates(
+    dispatcher: Dispatcher,
+    bot: Bot,
+    shards: ShardedQueue
+) -> None:
+    """
+    Получать апдейты long polling и раздавать их обработчикам.
+
+    Смещение сдвигается только после постановки апдейта в очередь,
+    так что при перегрузке обработчиков апдейты ждут на стороне Telegram.
+
+    Args:
+        dispatcher: Диспетчер aiogram (для списка типов апдейтов)
+        bot: Экземпляр бота
+        shards: Очереди обработчиков
+    """
+    await bot.delete_webhook(drop_pending_updates=DROP_PENDING_UPDATES)
+    allowed_updates = dispatcher.resolve_used_update_types()
+    offset = None
+
+    while True:
+        try:
+            updates = await bot.get_updates(
+                offset=offset,
+                timeout=POLLING_TIMEOUT,
+                allowed_updates=allowed_updates
+            )
+        except Exception as e:
+            print(f"Ошибка при получении апдейтов: {e}")
+            await asyncio.sleep(1)
+            continue
+
+        for update in updates:
+            await shards.put(update)
+            offset = update.update_id + 1
+
+
+async def run_sharded(dispatcher: Dispatcher, bot: Bot, workers: int) -> None:
+    """
+    Запустить процессы-обработчики и раздавать им апдейты.
+
+    Args:
+        dispatcher: Диспетчер главного процесса
+        bot: Экземпляр бота главного процесса
+        workers: Количество процессов-обработчиков
+    """
+    # spawn: у каждого обработчика свой цикл событий и свои соединения
+    context = multiprocessing.get_context("spawn")
+    queues = [
+        context.Queue(maxsize=max(1, UPDATE_QUEUE_SIZE // workers))
+        for _ in range(workers)
+    ]
+    processes = [
+        context.Process(
+            target=worker_main,
+            args=(index, shard_queue),
+            name=f"bot-worker-{index}"
+        )
+        for index, shard_queue in enumerate(queues)
+    ]
+    shards = ShardedQueue(queues, processes)
+
+    if BOT_MODE == "webhook":
+        await run_webhook(dispatcher, bot, queue=shards)
+        return
+
+    shards.start()
+    try:
+        await poll_updates(dispatcher, bot, shards)
+    finally:
+        await shards.stop()
+        await bot.session.close()
@@ -0,0 +1,113 @@
+"""
+Ограниченная очередь апдейтов с пулом обработчиков.
+Апдейты одного пользователя всегда попадают к одному обработчику,
+поэтому шаги FSM выполняются строго по порядку, а разные
+пользователи обрабатываются параллельно.
+"""
+import asyncio
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+
+
+def shard_key(update: Update) -> int:
+    """
+    Получить ключ распределения апдейта.
+
+    Args:
+        update: Апдейт Telegram
+
+    Returns:
+        Telegram ID отправителя, ID чата или ID апдейта
+    """
+    event = update.event
+    from_user = getattr(event, "from_user", None)
+    if from_user:
+        return from_user.id
+
+    chat = getattr(event, "chat", None)
+    if chat:
+        return chat.id
+
+    return update.update_id
+
+
+class UpdateQueue:
+    """
+    Пул обработчиков с отдельной ограниченной очередью на каждого.
+
+    Args:
+        dispatcher: Диспетчер aiogram
+        bot: Экземпляр бота
+        workers: Количество параллельных обработчиков
+        maxsize: Суммарная ёмкость очередей
+    """
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        bot: Bot,
+        workers: int,
+        maxsize: int
+    ) -> None:
+        self.dispatcher = dispatcher
+        self.bot = bot
+        self._queues = [
+            asyncio.Queue(maxsize=max(1, maxsize // workers))
+            for _ in range(workers)
+        ]
+        self._tasks: list[asyncio.Task] = []
+
+    def put_nowait(self, update: Update) -> None:
+        """
+        Поставить апдейт в очередь его обработчика.
+
+        Args:
+            update: Апдейт Telegram
+
+        Raises:
+            asyncio.QueueFull: Очередь обработчика переполнена
+        """
+        queue = self._queues[shard_key(update) % len(self._queues)]
+        queue.put_nowait(update)
+
+    async def put(self, update: Update) -> None:
+        """
+        Поставить апдейт в очередь, дождавшись свободного места.
+
+        Args:
+            update: Апдейт Telegram
+        """
+        queue = self._queues[shard_key(update) % len(self._queues)]
+        await queue.put(update)
+
+    def qsize(self) -> int:
+        """Количество апдейтов, ожидающих обработки."""
+        return sum(queue.qsize() for queue in self._queues)
+
+    def start(self) -> None:
+        """Запустить обработчики."""
+        self._tasks = [
+            asyncio.create_task(self._worker(queue))
+            for queue in self._queues
+        ]
+
+    async def stop(self) -> None:
+        """Дождаться обработки принятых апдейтов и остановить пул."""
+        for queue in self._queues:
+            await queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        """Последовательно обрабатывать апдейты из своей очереди."""
+        while True:
+            update = await queue.get()
+            try:
+                await self.dispatcher.feed_update(self.bot, update)
+            except Exception as e:
+                print(f"Ошибка при обработке апдейта {update.update_id}: {e}")
+            finally:
+                queue.task_done()
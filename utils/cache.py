@@ -0,0 +1,95 @@
+"""
+Ограниченный LRU-кеш с временем жизни записей.
+Используется для горячих данных, которые редко меняются,
+но читаются на каждом апдейте.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class LRUCache:
+    """
+    LRU-кеш фиксированного размера с TTL и счётчиками попаданий.
+
+    Args:
+        maxsize: Максимальное количество записей
+        ttl: Время жизни записи в секундах (0 — без ограничения)
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Получить значение по ключу.
+
+        Args:
+            key: Ключ записи
+            default: Значение, если записи нет или она устарела
+
+        Returns:
+            Значение из кеша или default
+        """
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = item
+        if expires_at and expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Записать значение, вытеснив самую старую запись при переполнении.
+
+        Args:
+            key: Ключ записи
+            value: Значение
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Удалить запись, если она есть.
+
+        Args:
+            key: Ключ записи
+        """
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Очистить кеш (счётчики сохраняются)."""
+        self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Получить статистику кеша для мониторинга.
+
+        Returns:
+            Словарь с размером, попаданиями, промахами и hit rate
+        """
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
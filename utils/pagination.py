@@ -0,0 +1,142 @@
+"""
+Keyset-пагинация для списков в инлайн-сообщениях.
+
+Страница выбирается условием по ID (id > курсор или id < курсор)
+вместо OFFSET, поэтому стоимость запроса не растёт с номером
+страницы. Запрос читает на одну строку больше размера страницы,
+чтобы узнать, есть ли страница дальше по направлению листания,
+а наличие страницы с другой стороны проверяет подзапросом EXISTS
+с теми же условиями.
+
+Кнопки листания несут курсор в callback_data:
+<префикс>:next:<ID последней строки> и <префикс>:prev:<ID первой строки>.
+"""
+from typing import Any, Sequence
+
+from aiogram.types import InlineKeyboardButton
+from sqlalchemy import Select, false
+
+from i18n.locales import get_text
+
+# Столбец страницы: есть ли строки по другую сторону курсора
+HAS_OTHER_SIDE = "has_other_side"
+
+
+def parse_page_callback(data: str) -> tuple[int, int | None]:
+    """
+    Разобрать callback_data кнопки листания.
+
+    Args:
+        data: Строка вида <префикс>:next:<ID> или <префикс>:prev:<ID>
+
+    Returns:
+        Кортеж (after_id, before_id) для keyset_query
+    """
+    _, direction, cursor = data.rsplit(":", 2)
+    if direction == "prev":
+        return 0, int(cursor)
+    return int(cursor), None
+
+
+def keyset_query(
+    query: Select,
+    id_column: Any,
+    page_size: int,
+    after_id: int = 0,
+    before_id: int | None = None
+) -> Select:
+    """
+    Ограничить запрос одной страницей.
+
+    Args:
+        query: Запрос без ORDER BY и LIMIT
+        id_column: Столбец-курсор (возрастающий уникальный ID)
+        page_size: Размер страницы
+        after_id: Строки с ID больше этого (вперёд)
+        before_id: Строки с ID меньше этого (назад)
+
+    Returns:
+        Запрос страницы (на одну строку больше page_size) со столбцом
+        HAS_OTHER_SIDE для split_page
+    """
+    # Те же условия по другую сторону курсора; correlate(None) не даёт
+    # подзапросу сослаться на таблицы внешнего запроса
+    if before_id is not None:
+        other_side = query.where(id_column >= before_id).correlate(None).exists()
+        query = query.where(id_column < before_id).order_by(id_column.desc())
+    elif after_id > 0:
+        other_side = query.where(id_column <= after_id).correlate(None).exists()
+        query = query.where(id_column > after_id).order_by(id_column)
+    else:
+        other_side = false()
+        query = query.where(id_column > after_id).order_by(id_column)
+
+    return query.add_columns(other_side.label(HAS_OTHER_SIDE)).limit(page_size + 1)
+
+
+def split_page(
+    rows: Sequence[Any],
+    page_size: int,
+    after_id: int = 0,
+    before_id: int | None = None
+) -> tuple[list[Any], bool, bool]:
+    """
+    Отрезать лишнюю строку и определить соседние страницы.
+
+    Args:
+        rows: Результат запроса keyset_query
+        page_size: Размер страницы
+        after_id: Тот же after_id, что и у запроса
+        before_id: Тот же before_id, что и у запроса
+
+    Returns:
+        Кортеж (строки страницы по возрастанию ID,
+        есть ли предыдущая, есть ли следующая)
+    """
+    has_more = len(rows) > page_size
+    has_other_side = bool(rows) and bool(getattr(rows[0], HAS_OTHER_SIDE))
+    page = list(rows[:page_size])
+    if before_id is not None:
+        page.reverse()
+        return page, has_more, has_other_side
+    return page, has_other_side, has_more
+
+
+def navigation_row(
+    prefix: str,
+    first_id: int,
+    last_id: int,
+    has_prev: bool,
+    has_next: bool,
+    lang: str
+) -> list[InlineKeyboardButton]:
+    """
+    Построить ряд кнопок листания.
+
+    Args:
+        prefix: Префикс callback_data
+        first_id: ID первой строки страницы
+        last_id: ID последней строки страницы
+        has_prev: Есть ли предыдущая страница
+        has_next: Есть ли следующая страница
+        lang: Код языка интерфейса
+
+    Returns:
+        Список кнопок (пустой, если листать некуда)
+    """
+    buttons = []
+    if has_prev:
+        buttons.append(
+            InlineKeyboardButton(
+                text=get_text("btn_prev", lang),
+                callback_data=f"{prefix}:prev:{first_id}"
+            )
+        )
+    if has_next:
+        buttons.append(
+            InlineKeyboardButton(
+                text=get_text("btn_next", lang),
+                callback_data=f"{prefix}:next:{last_id}"
+            )
+        )
+    return buttons
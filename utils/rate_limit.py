@@ -0,0 +1,89 @@
+"""
+Ограничитель частоты по алгоритму token bucket.
+"""
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Ведро токенов: rate токенов в секунду, не больше capacity за раз.
+
+    Args:
+        rate: Скорость пополнения (токенов в секунду), больше нуля
+        capacity: Ёмкость ведра (допустимый всплеск)
+
+    Raises:
+        ValueError: Если rate не больше нуля
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        if rate <= 0:
+            raise ValueError(f"Скорость ведра токенов должна быть больше 0: {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """
+        Взять токены, если они есть, без ожидания.
+
+        Args:
+            tokens: Количество токенов
+
+        Returns:
+            True, если токены взяты, иначе False
+        """
+        if time.monotonic() < self._paused_until:
+            return False
+
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """
+        Дождаться и взять токены.
+
+        Args:
+            tokens: Количество токенов
+        """
+        async with self._lock:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    continue
+
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Приостановить выдачу токенов (например, после RetryAfter).
+
+        Args:
+            seconds: Длительность паузы в секундах
+        """
+        self._paused_until = max(
+            self._paused_until,
+            time.monotonic() + seconds
+        )
+        self._tokens = 0
+        self._updated = self._paused_until
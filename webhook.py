@@ -0,0 +1,117 @@
+"""
+Приём апдейтов через webhook на сервере aiohttp.
+Запрос от Telegram только кладёт апдейт в очередь и сразу получает
+ответ, а обработка идёт в пуле обработчиков UpdateQueue.
+"""
+import asyncio
+import secrets
+
+from typing import Protocol
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from aiohttp import web
+
+from config.bot_config import (
+    DROP_PENDING_UPDATES,
+    WEBHOOK_URL,
+    WEBHOOK_HOST,
+    WEBHOOK_PORT,
+    WEBHOOK_PATH,
+    WEBHOOK_SECRET,
+    UPDATE_QUEUE_SIZE,
+    UPDATE_WORKERS
+)
+from update_queue import UpdateQueue
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class UpdateSink(Protocol):
+    """Очередь, в которую webhook передаёт принятые апдейты."""
+
+    def put_nowait(self, update: Update) -> None: ...
+
+    def start(self) -> None: ...
+
+    async def stop(self) -> None: ...
+
+
+def create_app(bot: Bot, queue: UpdateSink) -> web.Application:
+    """
+    Создать приложение aiohttp с обработчиком webhook.
+
+    Args:
+        bot: Экземпляр бота
+        queue: Очередь апдейтов
+
+    Returns:
+        Приложение aiohttp
+    """
+
+    async def handle_update(request: web.Request) -> web.Response:
+        if WEBHOOK_SECRET and not secrets.compare_digest(
+            request.headers.get(SECRET_HEADER, ""),
+            WEBHOOK_SECRET
+        ):
+            return web.Response(status=401)
+
+        update = Update.model_validate(
+            await request.json(),
+            context={"bot": bot}
+        )
+
+        try:
+            queue.put_nowait(update)
+        except asyncio.QueueFull:
+            # Telegram повторит доставку позже
+            return web.Response(status=503)
+
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_post(WEBHOOK_PATH, handle_update)
+    return app
+
+
+async def run_webhook(
+    dispatcher: Dispatcher,
+    bot: Bot,
+    queue: UpdateSink | None = None
+) -> None:
+    """
+    Зарегистрировать webhook и обслуживать апдейты до остановки.
+
+    Args:
+        dispatcher: Диспетчер aiogram
+        bot: Экземпляр бота
+        queue: Очередь апдейтов (по умолчанию — пул в этом процессе)
+    """
+    if queue is None:
+        queue = UpdateQueue(
+            dispatcher,
+            bot,
+            workers=UPDATE_WORKERS,
+            maxsize=UPDATE_QUEUE_SIZE
+        )
+    runner = web.AppRunner(create_app(bot, queue))
+
+    await dispatcher.emit_startup(bot=bot)
+    queue.start()
+    await runner.setup()
+    await web.TCPSite(runner, WEBHOOK_HOST, WEBHOOK_PORT).start()
+
+    await bot.set_webhook(
+        url=WEBHOOK_URL.rstrip("/") + WEBHOOK_PATH,
+        secret_token=WEBHOOK_SECRET or None,
+        allowed_updates=dispatcher.resolve_used_update_types(),
+        drop_pending_updates=DROP_PENDING_UPDATES
+    )
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        await queue.stop()
+        await dispatcher.emit_shutdown(bot=bot)
+        await bot.session.close()